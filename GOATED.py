@@ -1,7 +1,19 @@
 import os
 import re
+import sys
+import csv
+import io
 import json
+import time
+import argparse
+import contextlib
+import hashlib
+import mmap
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from colorama import Fore, Style, init
+from fastcopy import copy_file, merge_copy_stats, format_copy_rate
 
 # Initialize colorama for colorful output
 init(autoreset=True)
@@ -10,6 +22,14 @@ init(autoreset=True)
 mod_counters = {"Gun Skins": 0, "Hit Effect": 0, "Lootbox": 0, "Icon": 0}
 
 CONFIG_FILE = "directories.json"
+GUNS_FILE = "/storage/emulated/0/FILES_OBB/TXT/guns.txt"
+HEX_INDEX_FILE = "hex_index.json"
+# Repack-folder changelog: the JSONL journal is authoritative, the .txt is rendered from it
+CHANGELOG_FILE = "changelog.txt"
+JOURNAL_FILE = "changelog.jsonl"
+
+# Source directories that get staged into the repack folder, in processing order
+MOD_TYPES = ["gun_skins", "hit_effect", "lootbox", "icon"]
 
 # ===============================
 # Directory & Config Functions
@@ -23,6 +43,8 @@ def get_directories():
       4. Icon: /storage/emulated/0/FILES_OBB/ICON_MOD/
       5. Repack (destination folder): /storage/emulated/0/FILES_OBB/REPACK_OBB/
       6. Skin Index file path (used only for icon modding): /storage/emulated/0/FILES_OBB/TXT/skin_index.txt
+    An optional "workers" key in directories.json patches Hit Effect, Lootbox
+    and Icon files in that many processes (0 or 1 = serial, the default).
     """
     dirs = {
         "gun_skins": "/storage/emulated/0/FILES_OBB/GUN_SKIN/",
@@ -42,6 +64,16 @@ def save_directories(dirs):
     except Exception as e:
         print(Fore.RED + f"❌ Error saving directories: {e}")
 
+def parse_workers(value):
+    """The "workers" setting as a non-negative int; ValueError for anything else."""
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        workers = -1
+    if workers < 0:
+        raise ValueError(f"Invalid \"workers\" value {value!r}: expected a non-negative integer")
+    return workers
+
 def load_directories():
     try:
         if os.path.exists(CONFIG_FILE):
@@ -49,6 +81,11 @@ def load_directories():
                 data = json.load(f)
             required = ["gun_skins", "hit_effect", "lootbox", "icon", "repack", "skin_index"]
             if all(k in data for k in required):
+                try:
+                    data["workers"] = parse_workers(data.get("workers", 0))
+                except ValueError as e:
+                    print(Fore.YELLOW + f"⚠️ {e}. Patching one file at a time.")
+                    data["workers"] = 0
                 return data
         return None
     except Exception as e:
@@ -63,7 +100,7 @@ def decorate_gun_name(gun):
     Decorate a gun's name with a special color and a unique emoji for level 1 to 8.
     """
     name = gun['name']
-    match = re.search(r'\(Lv\. ?(\d+)\)', name)
+    match = LEVEL_PATTERN.search(name)
     if match:
         level = int(match.group(1))
         level_colors = {
@@ -103,8 +140,88 @@ def clean_gun_name_for_changelog(gun_name):
 # ===============================
 # Gun Data Functions
 # ===============================
+LEVEL_PATTERN = re.compile(r'\(Lv\. ?(\d+)\)')
+
+class GunCatalog(list):
+    """
+    The guns.txt entries (plain gun dicts, in file order) plus lookup tables
+    built once at load time:
+      by_id / by_hex - first gun for each ID / hex
+      variants       - normalized base name -> {"default", "hit_effect", "levels": {lv: gun}}
+    The Hit Effect and Lv. 5 substitutions are resolved per gun name up front,
+    so resolving a pair never scans the list.
+    """
+    __slots__ = ("by_id", "by_hex", "variants", "_hit_effect_of", "_level5_of")
+
+    def __init__(self, guns=()):
+        super().__init__(guns)
+        self.by_id = {}
+        self.by_hex = {}
+        self.variants = {}
+        for gun in self:
+            self.by_id.setdefault(gun["id"], gun)
+            self.by_hex.setdefault(gun["hex"], gun)
+            name = gun["name"]
+            if name.startswith("Default"):
+                group = self._variant_group(name.replace("Default", ""))
+                group.setdefault("default", gun)
+            if "Hit effect" in name:
+                group = self._variant_group(name.replace("Hit effect", ""))
+                group.setdefault("hit_effect", gun)
+            match = LEVEL_PATTERN.search(name)
+            if match:
+                group = self._variant_group(name.split(" (Lv.")[0])
+                group["levels"].setdefault(int(match.group(1)), gun)
+        self._hit_effect_of = {}
+        self._level5_of = {}
+        hit_effect_by_base = {}
+        level5_by_base = {}
+        for gun in self:
+            name = gun["name"]
+            if name.startswith("Default") and name not in self._hit_effect_of:
+                base_name = name.replace("Default", "").strip()
+                if base_name not in hit_effect_by_base:
+                    hit_effect_by_base[base_name] = self._find_hit_effect(base_name)
+                self._hit_effect_of[name] = hit_effect_by_base[base_name]
+            if "Lv." in name and name not in self._level5_of:
+                base_name = name.split(" (Lv.")[0].strip()
+                if base_name not in level5_by_base:
+                    level5_by_base[base_name] = self._find_level5(base_name)
+                self._level5_of[name] = level5_by_base[base_name]
+
+    def _variant_group(self, base_name):
+        key = normalize_gun_name(base_name)
+        return self.variants.setdefault(key, {"default": None, "hit_effect": None, "levels": {}})
+
+    def _find_hit_effect(self, base_name):
+        group = self.variants.get(normalize_gun_name(base_name))
+        if group and group["hit_effect"]:
+            return group["hit_effect"]
+        # Names that don't share a base: fall back to the substring rule.
+        return next((gun for gun in self if "Hit effect" in gun["name"] and base_name in gun["name"]), None)
+
+    def _find_level5(self, base_name):
+        group = self.variants.get(normalize_gun_name(base_name))
+        if group and 5 in group["levels"]:
+            return group["levels"][5]
+        return next((gun for gun in self if base_name in gun["name"] and "(Lv. 5)" in gun["name"]), None)
+
+    def find_by_id(self, gun_id):
+        return self.by_id.get(gun_id)
+
+    def find_by_hex(self, hex_val):
+        return self.by_hex.get(hex_val.lower())
+
+    def hit_effect_variant(self, gun):
+        """'Hit effect' gun for a 'Default' gun, or None."""
+        return self._hit_effect_of.get(gun["name"])
+
+    def level5_variant(self, gun):
+        """'(Lv. 5)' sibling of a levelled gun, or None."""
+        return self._level5_of.get(gun["name"])
+
 def read_guns_file(txt_file):
-    """Read guns.txt and return a list of gun entries."""
+    """Read guns.txt and return a GunCatalog of gun entries."""
     try:
         with open(txt_file, 'r', encoding='utf-8', errors='replace') as f:
             lines = f.readlines()
@@ -117,10 +234,10 @@ def read_guns_file(txt_file):
                     "hex": parts[1].lower(),
                     "name": parts[2]
                 })
-        return guns
+        return GunCatalog(guns)
     except Exception as e:
         print(Fore.RED + f"❌ Error reading {txt_file}: {e}")
-        return []
+        return GunCatalog()
 
 def find_matching_guns(guns, query):
     query = query.lower()
@@ -129,8 +246,38 @@ def find_matching_guns(guns, query):
 # ===============================
 # Skin Index Parsing & Fuzzy Matching
 # ===============================
+def new_skin_index():
+    """
+    Empty precompiled skin index:
+      entries    - [{"name", "normalized", "index", "category"}] in file order
+      by_name    - normalized name -> entry position
+      by_token   - word -> set of entry positions containing it
+      categories - '###' category -> entry positions
+      cache      - gun name -> resolved index hex (or None)
+    """
+    return {"entries": [], "by_name": {}, "by_token": {}, "categories": {}, "cache": {}}
+
+def add_skin_index_entry(skin_index, gun_name, index_hex, category):
+    normalized = normalize_gun_name(gun_name)
+    pos = skin_index["by_name"].get(normalized)
+    if pos is not None:
+        # Same name listed twice: the later index wins, as with the old dict.
+        skin_index["entries"][pos]["index"] = index_hex
+        return
+    pos = len(skin_index["entries"])
+    skin_index["entries"].append({
+        "name": gun_name,
+        "normalized": normalized,
+        "index": index_hex,
+        "category": category
+    })
+    skin_index["by_name"][normalized] = pos
+    for token in set(normalized.split()):
+        skin_index["by_token"].setdefault(token, set()).add(pos)
+    skin_index["categories"].setdefault(category, []).append(pos)
+
 def parse_skin_index_file(file_path):
-    index_dict = {}
+    skin_index = new_skin_index()
     try:
         with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
             current_category = None
@@ -145,11 +292,11 @@ def parse_skin_index_file(file_path):
                         name_part, idx_part = line.rsplit(" - ", 1)
                         gun_name = name_part.strip()
                         index_hex = idx_part.strip().lower()
-                        index_dict[gun_name.lower()] = index_hex
-        print(Fore.GREEN + f"✅ Parsed skin index file '{file_path}' with {len(index_dict)} entries.")
+                        add_skin_index_entry(skin_index, gun_name, index_hex, current_category)
+        print(Fore.GREEN + f"✅ Parsed skin index file '{file_path}' with {len(skin_index['entries'])} entries.")
     except Exception as e:
         print(Fore.RED + f"❌ Error parsing skin index file '{file_path}': {e}")
-    return index_dict
+    return skin_index
 
 def normalize_gun_name(name):
     name = name.lower()
@@ -157,242 +304,1030 @@ def normalize_gun_name(name):
         name = name.replace(ch, " ")
     return " ".join(name.split())
 
-def get_skin_index_for_gun(skin_index_dict, gun_name):
+def get_skin_index_for_gun(skin_index, gun_name):
+    """
+    Resolve a gun's icon index from a precompiled skin index.
+
+    Candidates are the entries sharing a word with the gun name (every entry if
+    none do); a candidate matches when one normalized name contains the other.
+    The best match is:
+      1. the exact normalized name,
+      2. else the longest key contained in the gun name,
+      3. else the shortest key containing the gun name,
+    with ties going to the entry listed first in skin_index.txt.
+    """
+    cache = skin_index["cache"]
+    if gun_name in cache:
+        return cache[gun_name]
     norm_gun = normalize_gun_name(gun_name)
-    for key, value in skin_index_dict.items():
-        norm_key = normalize_gun_name(key)
-        if norm_gun in norm_key or norm_key in norm_gun:
-            return value
-    return None
+    entries = skin_index["entries"]
+    result = None
+    pos = skin_index["by_name"].get(norm_gun)
+    if pos is not None:
+        result = entries[pos]["index"]
+    else:
+        candidates = set()
+        for token in norm_gun.split():
+            candidates |= skin_index["by_token"].get(token, set())
+        if not candidates:
+            # Partial-word matches cannot be found through the token index.
+            candidates = range(len(entries))
+        best = None
+        for pos in candidates:
+            norm_key = entries[pos]["normalized"]
+            if norm_key in norm_gun:
+                rank = (0, -len(norm_key), pos)
+            elif norm_gun in norm_key:
+                rank = (1, len(norm_key), pos)
+            else:
+                continue
+            if best is None or rank < best:
+                best = rank
+        if best is not None:
+            result = entries[best[2]]["index"]
+    cache[gun_name] = result
+    return result
+
+# ===============================
+# Byte Patch Engine
+# ===============================
+def hex_to_bytes(hex_str):
+    """Convert a catalog hex string (spaces allowed) to raw bytes."""
+    return bytes.fromhex(hex_str.replace(" ", ""))
+
+def read_file_bytes(file_path):
+    """Read a file straight into a mutable bytearray without a hex round-trip."""
+    data = bytearray(os.path.getsize(file_path))
+    with open(file_path, "rb") as f:
+        read = f.readinto(data)
+    del data[read:]
+    return data
+
+def write_file_bytes(file_path, data):
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+# Containment checks look at the file this many bytes at a time
+SCAN_CHUNK_SIZE = 1 << 20
+
+def iter_file_windows(f, overlap, chunk_size=SCAN_CHUNK_SIZE):
+    """
+    Yield successive windows of an open binary file, chunk_size bytes each plus
+    the previous overlap bytes, so a pattern up to overlap + 1 bytes long that
+    crosses a chunk boundary is still whole in one window. Memory-maps the file
+    where possible and falls back to buffered reads (e.g. where mmap is refused).
+    """
+    try:
+        view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        view = None
+    if view is not None:
+        with view:
+            for start in range(0, len(view), chunk_size):
+                yield view[max(0, start - overlap):start + chunk_size]
+        return
+    tail = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        window = tail + chunk
+        yield window
+        tail = window[-overlap:] if overlap else b""
+
+def find_patterns_in_file(file_path, patterns, first_only=False):
+    """
+    Set of the byte patterns present in a file, scanning it in windows and
+    stopping as soon as every pattern (or, with first_only, any) was seen.
+    """
+    remaining = {p for p in patterns if p}
+    found = set()
+    if not remaining:
+        return found
+    overlap = max(len(p) for p in remaining) - 1
+    with open(file_path, "rb") as f:
+        for window in iter_file_windows(f, overlap):
+            hits = {p for p in remaining if p in window}
+            if hits:
+                found |= hits
+                remaining -= hits
+                if first_only or not remaining:
+                    break
+    return found
+
+def file_contains_any(file_path, patterns):
+    """True as soon as any of the byte patterns is found in the file."""
+    return bool(find_patterns_in_file(file_path, patterns, first_only=True))
+
+def find_all_bytes(data, pattern, start=0, end=None):
+    """
+    Return the byte-aligned, non-overlapping offsets of pattern in data[start:end],
+    scanning left to right exactly like str.replace / re.finditer would.
+    Works on bytes, bytearray and mmap objects.
+    """
+    positions = []
+    if not pattern:
+        return positions
+    if end is None:
+        end = len(data)
+    pos = data.find(pattern, start, end)
+    while pos != -1:
+        positions.append(pos)
+        pos = data.find(pattern, pos + len(pattern), end)
+    return positions
+
+def splice_bytes(data, positions, old_len, new):
+    """
+    Overwrite data[pos:pos + old_len] with new at every offset in positions.
+    Same-length patches are done in place; otherwise the buffer is rebuilt once.
+    Returns the (possibly new) bytearray.
+    """
+    if not positions:
+        return data
+    if old_len == len(new):
+        for pos in positions:
+            data[pos:pos + old_len] = new
+        return data
+    out = bytearray()
+    prev = 0
+    for pos in positions:
+        out += data[prev:pos]
+        out += new
+        prev = pos + old_len
+    out += data[prev:]
+    return out
+
+def replace_all_bytes(data, old, new):
+    """Replace every occurrence of old with new. Returns (data, occurrences)."""
+    positions = find_all_bytes(data, old)
+    return splice_bytes(data, positions, len(old), new), len(positions)
+
+def merge_windows(anchor_positions, before):
+    """
+    Merge the windows [pos - before, pos) preceding each anchor into sorted,
+    disjoint ranges. Returns (starts, ends) ready for bisect lookups.
+    """
+    starts = []
+    ends = []
+    for pos in sorted(anchor_positions):
+        start = max(0, pos - before)
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], pos)
+        elif start < pos:
+            starts.append(start)
+            ends.append(pos)
+    return starts, ends
+
+def in_windows(windows, pos):
+    starts, ends = windows
+    i = bisect_right(starts, pos) - 1
+    return i >= 0 and pos < ends[i]
+
+def patch_in_windows(data, anchor, before, old, new):
+    """
+    Replace every occurrence of old that starts inside the 'before' bytes
+    preceding an occurrence of anchor. Returns (data, replaced_count).
+    """
+    windows = merge_windows(find_all_bytes(data, anchor), before)
+    if not windows[0]:
+        return data, 0
+    hits = [pos for pos in find_all_bytes(data, old, 0, windows[1][-1] + len(old) - 1)
+            if in_windows(windows, pos)]
+    return splice_bytes(data, hits, len(old), new), len(hits)
 
 # ===============================
 # Hex and Index Functions
 # ===============================
 def replace_index(file_path, source_index_hex, target_index_hex):
     try:
-        with open(file_path, 'rb') as f:
-            data = f.read().hex()
-        data = data.replace(source_index_hex, target_index_hex)
-        with open(file_path, 'wb') as f:
-            f.write(bytes.fromhex(data))
+        data = read_file_bytes(file_path)
+        data, _ = replace_all_bytes(data, hex_to_bytes(source_index_hex), hex_to_bytes(target_index_hex))
+        write_file_bytes(file_path, data)
         print(Fore.GREEN + f"✅ Replaced index hex '{source_index_hex}' -> '{target_index_hex}' in file '{file_path}'.")
     except Exception as e:
         print(Fore.RED + f"❌ Error replacing index hex in file '{file_path}': {e}")
 
 def replace_hex(file_path, source_hex, target_hex):
     try:
-        with open(file_path, 'rb') as f:
-            data = f.read().hex()
-        data = data.replace(source_hex.replace(" ", ""), target_hex.replace(" ", ""))
-        with open(file_path, 'wb') as f:
-            f.write(bytes.fromhex(data))
+        data = read_file_bytes(file_path)
+        data, _ = replace_all_bytes(data, hex_to_bytes(source_hex), hex_to_bytes(target_hex))
+        write_file_bytes(file_path, data)
         print(Fore.GREEN + f"✅ Replaced hex '{source_hex}' -> '{target_hex}' in '{os.path.basename(file_path)}'.")
     except Exception as e:
         print(Fore.RED + f"❌ Error replacing hex in file '{file_path}': {e}")
 
+# ===============================
+# Hex Presence Index
+# ===============================
+def catalog_signature(hexes):
+    """Stable fingerprint of the catalog hexes an index was built against."""
+    return hashlib.sha1("\n".join(sorted(hexes)).encode("utf-8")).hexdigest()
+
+def load_hex_index():
+    try:
+        if os.path.exists(HEX_INDEX_FILE):
+            with open(HEX_INDEX_FILE, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and "dirs" in data:
+                return data
+    except Exception as e:
+        print(Fore.YELLOW + f"⚠️ Ignoring unreadable hex index '{HEX_INDEX_FILE}': {e}")
+    return {"catalog": None, "dirs": {}}
+
+def save_hex_index(index):
+    try:
+        with open(HEX_INDEX_FILE, 'w') as f:
+            json.dump(index, f)
+    except Exception as e:
+        print(Fore.RED + f"❌ Error saving hex index: {e}")
+
+def scan_file_for_hexes(file_path, catalog):
+    """Return the catalog hexes (as strings) present in the file, byte-aligned."""
+    data = read_file_bytes(file_path)
+    return [hex_val for hex_val, hex_bytes in catalog.items() if hex_bytes in data]
+
+def refresh_dir_index(entry, src_dir, catalog, rescan_all):
+    """
+    Bring one directory's index entry up to date. Files whose size and mtime
+    are unchanged keep their recorded hexes; everything else is rescanned.
+    Returns the number of files that had to be read.
+    """
+    old_files = {} if rescan_all else entry.get("files", {})
+    files = {}
+    order = []
+    scanned = 0
+    for file_name in os.listdir(src_dir):
+        file_path = os.path.join(src_dir, file_name)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        if not os.path.isfile(file_path):
+            continue
+        order.append(file_name)
+        old = old_files.get(file_name)
+        if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime_ns:
+            files[file_name] = old
+            continue
+        try:
+            hexes = scan_file_for_hexes(file_path, catalog)
+        except Exception:
+            order.pop()
+            continue
+        scanned += 1
+        files[file_name] = {"size": st.st_size, "mtime": st.st_mtime_ns, "hexes": hexes}
+    entry["path"] = src_dir
+    entry["order"] = order
+    entry["files"] = files
+    return scanned
+
+def build_hex_index(guns, dirs):
+    """
+    Load hex_index.json, update it incrementally for every source directory and
+    return the in-memory lookup per mod: {"order": [file names], "position": {file: i},
+    "by_hex": {hex: set(files)}}.
+    A changed guns.txt catalog forces a full rescan.
+    """
+    catalog = {}
+    for gun in guns:
+        try:
+            catalog[gun["hex"]] = hex_to_bytes(gun["hex"])
+        except ValueError:
+            continue
+    signature = catalog_signature(catalog)
+    index = load_hex_index()
+    rescan_all = index.get("catalog") != signature
+    index["catalog"] = signature
+    lookup = {}
+    total_scanned = 0
+    for mod in MOD_TYPES:
+        src_dir = dirs.get(mod)
+        if not src_dir or not os.path.exists(src_dir):
+            index["dirs"].pop(mod, None)
+            continue
+        entry = index["dirs"].get(mod, {})
+        if entry.get("path") != src_dir:
+            entry = {}
+        total_scanned += refresh_dir_index(entry, src_dir, catalog, rescan_all)
+        index["dirs"][mod] = entry
+        by_hex = {}
+        for file_name, info in entry["files"].items():
+            for hex_val in info["hexes"]:
+                by_hex.setdefault(hex_val, set()).add(file_name)
+        position = {file_name: i for i, file_name in enumerate(entry["order"])}
+        lookup[mod] = {"order": entry["order"], "position": position, "by_hex": by_hex}
+    if total_scanned:
+        print(Fore.GREEN + f"✅ Hex index updated ({total_scanned} file(s) scanned).")
+    save_hex_index(index)
+    return lookup
+
+def lookup_candidate_files(mod_index, hexes):
+    """Files of one source dir containing any of the hexes, in directory order."""
+    hits = set()
+    for hex_val in hexes:
+        hits |= mod_index["by_hex"].get(hex_val, set())
+    return sorted(hits, key=mod_index["position"].get)
+
 # ===============================
 # File Copying Function (Bulk Mode)
 # ===============================
-def copy_files_to_repack_mod(mod_type, src_dir, repack_folder, condition_hexes, file_modtype_map):
+def copy_files_to_repack_mod(mod_type, src_dir, repack_folder, condition_hexes, file_modtype_map, hex_index=None,
+                             staged=None, overlay=None):
+    """
+    Stage files from src_dir that contain one of condition_hexes into the repack folder.
+    With a hex_index the source dats are never opened; only already staged copies
+    are checked, since they may have gained a hex from an earlier swap.
+    staged is the caller's set of files already in the repack folder (listed when
+    not given); newly copied files are added to it.
+    With an overlay dict nothing is copied: each newly staged file is recorded as
+    overlay[file_name] = source path, and is only written to the repack folder
+    by whoever patches it (see overlay_read_path).
+    """
     files_copied = []
-    for file_name in os.listdir(src_dir):
+    copy_stats = []
+    try:
+        condition_bytes = [hex_to_bytes(hex_val) for hex_val in condition_hexes]
+    except ValueError as e:
+        print(Fore.RED + f"❌ Invalid hex in guns.txt ({', '.join(condition_hexes)}): {e}. Skipping {mod_type}.")
+        return files_copied
+    if hex_index is not None and mod_type in hex_index:
+        mod_index = hex_index[mod_type]
+        candidates = set(lookup_candidate_files(mod_index, condition_hexes))
+        if staged is None:
+            staged = set(os.listdir(repack_folder))
+        file_names = [f for f in mod_index["order"] if f in candidates or f in staged]
+    else:
+        candidates = None
+        file_names = os.listdir(src_dir)
+    for file_name in file_names:
         src_file_path = os.path.join(src_dir, file_name)
         if not os.path.isfile(src_file_path):
             continue
         dest_file_path = os.path.join(repack_folder, file_name)
         # If file already exists, check if it already has one of the condition hex values
-        if os.path.exists(dest_file_path):
+        if (file_name in staged) if staged is not None else os.path.exists(dest_file_path):
             try:
-                with open(dest_file_path, "rb") as f:
-                    dest_data = f.read().hex()
-                if any(hex_val in dest_data for hex_val in condition_hexes):
+                if file_contains_any(dest_file_path, condition_bytes):
                     file_modtype_map[file_name] = mod_type
                     continue
             except Exception:
                 pass
-        try:
-            with open(src_file_path, "rb") as f:
-                src_data = f.read().hex()
-        except Exception:
-            continue
-        if not any(hex_val in src_data for hex_val in condition_hexes):
-            continue
-        with open(src_file_path, "rb") as src, open(dest_file_path, "wb") as dst:
-            dst.write(src.read())
+        if candidates is not None:
+            if file_name not in candidates:
+                continue
+        else:
+            try:
+                if not file_contains_any(src_file_path, condition_bytes):
+                    continue
+            except Exception:
+                continue
         files_copied.append(file_name)
         file_modtype_map[file_name] = mod_type
-    if files_copied:
-        print(Fore.GREEN + f"✅ Copied {len(files_copied)} file(s) from {mod_type} into repack folder.")
+        if overlay is not None:
+            overlay[file_name] = src_file_path
+            continue
+        copy_stats.append(copy_file(src_file_path, dest_file_path))
+        if staged is not None:
+            staged.add(file_name)
+    if files_copied and overlay is not None:
+        print(Fore.GREEN + f"✅ Staged {len(files_copied)} file(s) from {mod_type} (copied only when patched).")
+    elif files_copied:
+        print(Fore.GREEN + f"✅ Copied {len(files_copied)} file(s) from {mod_type} into repack folder "
+                           f"[{format_copy_rate(merge_copy_stats(copy_stats))}].")
     return files_copied
 
+def overlay_read_path(overlay, repack_folder, file_name):
+    """Where a staged file's current content lives: its source while still virtual, else the repack copy."""
+    return overlay.get(file_name) or os.path.join(repack_folder, file_name)
+
+# ===============================
+# Changelog Journal
+# ===============================
+# One JSON row per changelog entry, appended as entries are made. Rows carry
+# the file, both guns (cleaned names, ids, hexes), the mod type and the detail
+# lines, so callers can filter rows instead of regex-scanning changelog.txt.
+LEGACY_ENTRY_PATTERN = re.compile(
+    r"=+\n(\d+)\. Mod Type: (.+)\nFile: (.+)\nSource Gun: (.*) \nTarget Gun: (.*) \n((?:.*\n)*?)=+"
+)
+
+def parse_legacy_changelog(text):
+    """Rows for a changelog.txt written before the journal existed (unparsable blocks are kept verbatim)."""
+    rows = []
+    for block in text.split("\n\n"):
+        if not block.strip():
+            continue
+        match = LEGACY_ENTRY_PATTERN.fullmatch(block)
+        row = {"text": block}
+        if match:
+            parsed = {
+                "number": int(match.group(1)),
+                "mod_type": match.group(2),
+                "file": match.group(3).strip(),
+                "source_gun": match.group(4),
+                "target_gun": match.group(5),
+                "details": match.group(6).splitlines(),
+            }
+            if render_changelog_entry(parsed) == block:
+                row = parsed
+        rows.append(row)
+    return rows
+
+def changelog_digest(changelog_path):
+    """sha256 of changelog.txt, or None when it does not exist."""
+    try:
+        with open(changelog_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def load_journal(repack_folder):
+    """
+    Journal rows of a repack folder. The journal is only trusted when its last
+    {"changelog_sha256"} stamp matches changelog.txt; a journal that is missing,
+    unreadable or stale (changelog.txt edited or deleted since it was rendered)
+    is rebuilt from changelog.txt, or emptied when there is none.
+    """
+    journal_path = os.path.join(repack_folder, JOURNAL_FILE)
+    changelog_path = os.path.join(repack_folder, CHANGELOG_FILE)
+    digest = changelog_digest(changelog_path)
+    if os.path.exists(journal_path):
+        rows = []
+        stamps = []
+        try:
+            with open(journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    if "changelog_sha256" in row:
+                        stamps.append(row["changelog_sha256"])
+                    else:
+                        rows.append(row)
+        except (OSError, ValueError) as e:
+            print(Fore.RED + f"❌ Error reading changelog journal: {e}")
+            stamps = []
+        if stamps and stamps[-1] == digest:
+            return rows
+        print(Fore.YELLOW + "⚠️ changelog.jsonl does not match changelog.txt. Rebuilding it from changelog.txt.")
+    rows = []
+    try:
+        if digest is not None:
+            with open(changelog_path, "r", encoding="utf-8") as f:
+                rows = parse_legacy_changelog(f.read())
+        write_journal(repack_folder, rows)
+        stamp_journal(repack_folder)
+    except Exception as e:
+        print(Fore.RED + f"❌ Error reading changelog: {e}")
+    return rows
+
+def write_journal(repack_folder, rows, append=False):
+    """Write rows to changelog.jsonl, replacing it unless append=True."""
+    with open(os.path.join(repack_folder, JOURNAL_FILE), "a" if append else "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+def stamp_journal(repack_folder):
+    """Record the changelog.txt the journal was rendered to, so readers can tell when it went stale."""
+    digest = changelog_digest(os.path.join(repack_folder, CHANGELOG_FILE))
+    write_journal(repack_folder, [{"changelog_sha256": digest}], append=True)
+
+def index_journal(rows):
+    """Group journal rows by file, gun name and mod type: {"by_file", "by_gun", "by_mod"}."""
+    index = {"by_file": {}, "by_gun": {}, "by_mod": {}}
+    for row in rows:
+        if "file" not in row:
+            continue
+        index["by_file"].setdefault(row["file"], []).append(row)
+        index["by_mod"].setdefault(row["mod_type"], []).append(row)
+        for gun_name in {row["source_gun"], row["target_gun"]}:
+            index["by_gun"].setdefault(gun_name, []).append(row)
+    return index
+
+def render_changelog(repack_folder, rows, append_after=None):
+    """
+    Regenerate changelog.txt from journal rows and stamp the journal with it.
+    Returns its path. append_after=n means the file already holds the first n
+    rows, so only the rest are appended.
+    """
+    changelog_path = os.path.join(repack_folder, CHANGELOG_FILE)
+    if append_after is None:
+        with open(changelog_path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(render_changelog_entry(row) for row in rows))
+    else:
+        new_rows = rows[append_after:]
+        if new_rows:
+            with open(changelog_path, "a", encoding="utf-8") as f:
+                f.write(("\n\n" if append_after else "") + "\n\n".join(render_changelog_entry(row) for row in new_rows))
+    stamp_journal(repack_folder)
+    return changelog_path
+
 # ===============================
 # Modding Functions for Each Part
 # ===============================
-def revert_mod_gun_skin_files(file_paths, source_hex, target_hex, source_gun, target_gun):
-    global mod_counters
-    log_msgs = []
-    modified_files = []
-    source_long = None
-    for file_path in file_paths:
+# The patch_* functions edit in-memory buffers and return changelog details;
+# the *_file wrappers around them read and write a single staged file.
+def format_changelog_entry(mod_type, file_name, source_gun, target_gun, details):
+    """Number a new changelog entry and return it as a journal row."""
+    mod_counters[mod_type] += 1
+    return {
+        "number": mod_counters[mod_type],
+        "mod_type": mod_type,
+        "file": file_name,
+        "source_gun": clean_gun_name_for_changelog(source_gun["name"]),
+        "target_gun": clean_gun_name_for_changelog(target_gun["name"]),
+        "source_id": source_gun.get("id"),
+        "target_id": target_gun.get("id"),
+        "source_hex": source_gun.get("hex"),
+        "target_hex": target_gun.get("hex"),
+        "details": list(details),
+    }
+
+def render_changelog_entry(row):
+    """changelog.txt block for a journal row (legacy rows keep their original text)."""
+    if "text" in row:
+        return row["text"]
+    return (
+        "==============================\n"
+        f"{row['number']}. Mod Type: {row['mod_type']}\n"
+        f"File: {row['file']}\n"
+        f"Source Gun: {row['source_gun']} \n"
+        f"Target Gun: {row['target_gun']} \n"
+        + "".join(f"{line}\n" for line in row["details"]) +
+        "=============================="
+    )
+
+def find_long_hex(data, source_bytes):
+    """Up to 5 bytes of context + the first occurrence of source_bytes in data, or None."""
+    pos_source = data.find(source_bytes)
+    if pos_source == -1:
+        return None
+    available = 5 if pos_source >= 5 else pos_source
+    return bytes(data[pos_source - available: pos_source + len(source_bytes)])
+
+def gun_skin_source_paths(file_names, src_dir, hex_index, source_hex):
+    """
+    (file_name, source path) of the staged gun skin files whose unmodified copy
+    in src_dir holds source_hex according to the hex index, in staging order.
+    Without an index every staged file is a candidate.
+    """
+    holders = None
+    if hex_index is not None and "gun_skins" in hex_index:
+        holders = hex_index["gun_skins"]["by_hex"].get(source_hex, set())
+    return [(file_name, os.path.join(src_dir, file_name)) for file_name in file_names
+            if holders is None or file_name in holders]
+
+def extract_long_hex(buffers, source_hex, source_bytes, source_paths=(), long_hex_cache=None):
+    """
+    'Long hex' of a gun skin: up to 5 bytes of context + the source hex.
+    It is taken from the first unmodified source file in source_paths holding
+    it, so swaps made earlier in the session cannot hide it, and is cached per
+    source hex in long_hex_cache for the session. Only when no source file holds
+    it is it taken from the first staged buffer containing it (not cached).
+    """
+    if long_hex_cache is not None and source_hex in long_hex_cache:
+        return long_hex_cache[source_hex]
+    for file_name, path in source_paths:
         try:
-            with open(file_path, "rb") as f:
-                data = f.read().hex()
-            pos_source = data.find(source_hex)
-            if pos_source != -1:
-                available = 10 if pos_source >= 10 else pos_source
-                source_long = data[pos_source - available: pos_source + len(source_hex)]
-                print(Fore.GREEN + f"✅ [Gun Skins] Extracted 'long hex' from '{os.path.basename(file_path)}'")
-                break
+            source_long = find_long_hex(read_file_bytes(path), source_bytes)
         except Exception as e:
-            print(Fore.RED + f"❌ Error reading file '{os.path.basename(file_path)}': {e}")
+            print(Fore.RED + f"❌ Error reading file '{file_name}': {e}")
+            continue
+        if source_long is not None:
+            print(Fore.GREEN + f"✅ [Gun Skins] Extracted 'long hex' from '{file_name}'")
+            if long_hex_cache is not None:
+                long_hex_cache[source_hex] = source_long
+            return source_long
+    for file_name, data in buffers.items():
+        source_long = find_long_hex(data, source_bytes)
+        if source_long is not None:
+            print(Fore.GREEN + f"✅ [Gun Skins] Extracted 'long hex' from '{file_name}'")
+            return source_long
+    return None
+
+def splice_long_hex(data, starts, size, source_long):
+    """
+    Write source_long over data[start:start + size] for every start (ascending),
+    in one pass. Later occurrences are applied first where regions overlap.
+    """
+    if len(source_long) == size:
+        for start in reversed(starts):
+            data[start:start + size] = source_long
+        return data
+    if all(b - a >= size for a, b in zip(starts, starts[1:])):
+        return splice_bytes(data, starts, size, source_long)
+    for start in reversed(starts):
+        data[start:start + size] = source_long
+    return data
+
+def patch_gun_skin_buffers(buffers, source_hex, target_hex, source_gun, target_gun, source_paths=(), long_hex_cache=None):
+    """
+    Gun Skins swap over staged buffers ({file_name: bytearray}, in staging order).
+    The source's long hex (see extract_long_hex; source_paths from
+    gun_skin_source_paths) is written over the 5 bytes before + every target hex
+    occurrence. Patched buffers are stored back into the dict.
+    Returns (changelog rows, modified_file_names) or (None, []) when nothing changed.
+    """
+    source_bytes = hex_to_bytes(source_hex)
+    target_bytes = hex_to_bytes(target_hex)
+    source_long = extract_long_hex(buffers, source_hex, source_bytes, source_paths, long_hex_cache)
     if source_long is None:
         print(Fore.YELLOW + f"⚠️ [Gun Skins] Source hex '{source_hex}' not found in any file.")
         return None, []
-    total_replacements = 0
+    size = 5 + len(target_bytes)
+    log_msgs = []
+    modified_files = []
+    for file_name, data in buffers.items():
+        starts = [pos - 5 for pos in find_all_bytes(data, target_bytes) if pos >= 5]
+        if not starts:
+            continue
+        buffers[file_name] = splice_long_hex(data, starts, size, source_long)
+        log_msgs.append(log_file_patch("Gun Skins", file_name, source_gun, target_gun, [
+            f"Replaced {len(starts)} occurrence(s) with long hex: {source_long.hex()}"
+        ]))
+        modified_files.append(file_name)
+    if log_msgs:
+        return log_msgs, modified_files
+    print(Fore.YELLOW + f"⚠️ [Gun Skins] No valid occurrences of target hex '{target_hex}' found in any file.")
+    return None, []
+
+def patch_hex_swap(data, source_hex, target_hex):
+    """Plain source→target swap used by Hit Effect and Lootbox. Returns (data, changelog details or None)."""
+    source_bytes = hex_to_bytes(source_hex)
+    target_bytes = hex_to_bytes(target_hex)
+    if source_bytes not in data or source_bytes == target_bytes:
+        return data, None
+    data, _ = replace_all_bytes(data, source_bytes, target_bytes)
+    return data, [f"Replaced hex: {source_hex} with {target_hex}"]
+
+def patch_icon(data, source_hex, target_hex, source_index_hex, target_index_hex):
+    """
+    Icon swap: the index hex is replaced only in the 50 bytes before each source hex,
+    then the source hex itself. Returns (data, changelog details or None).
+    """
+    source_bytes = hex_to_bytes(source_hex)
+    target_bytes = hex_to_bytes(target_hex)
+    source_index = hex_to_bytes(source_index_hex)
+    target_index = hex_to_bytes(target_index_hex)
+    if source_bytes not in data:
+        return data, None
+    data, index_hits = patch_in_windows(data, source_bytes, 50, source_index, target_index)
+    changed = bool(index_hits) and source_index != target_index
+    source_hits = find_all_bytes(data, source_bytes)
+    changed = changed or (bool(source_hits) and source_bytes != target_bytes)
+    data = splice_bytes(data, source_hits, len(source_bytes), target_bytes)
+    if not changed:
+        return data, None
+    return data, [
+        f"Source Index: {source_index_hex}",
+        f"Target Index: {target_index_hex}",
+        f"Replaced hex: {source_hex} with {target_hex}",
+    ]
+
+def revert_mod_gun_skin_files(file_paths, source_hex, target_hex, source_gun, target_gun, read_paths=None,
+                              source_paths=(), long_hex_cache=None):
+    """Gun Skins swap on staged files; read_paths ({file_name: path}) reads some from elsewhere (overlay)."""
+    buffers = {}
+    paths = {}
+    read_paths = read_paths or {}
     for file_path in file_paths:
+        file_name = os.path.basename(file_path)
         try:
-            with open(file_path, "rb") as f:
-                data = f.read().hex()
-            replacements = []
-            for m in re.finditer(re.escape(target_hex), data):
-                pos = m.start()
-                if pos < 10:
-                    continue
-                replacements.append((pos - 10, pos + len(target_hex)))
-            if replacements:
-                new_data = data
-                for start, end in sorted(replacements, key=lambda x: x[0], reverse=True):
-                    new_data = new_data[:start] + source_long + new_data[end:]
-                total_replacements += 1
-                with open(file_path, "wb") as f:
-                    f.write(bytes.fromhex(new_data))
-                mod_counters["Gun Skins"] += 1
-                log_entry = (
-                    "==============================\n"
-                    f"{mod_counters['Gun Skins']}. Mod Type: Gun Skins\n"
-                    f"File: {os.path.basename(file_path)}\n"
-                    f"Source Gun: {clean_gun_name_for_changelog(source_gun['name'])} \n"
-                    f"Target Gun: {clean_gun_name_for_changelog(target_gun['name'])} \n"
-                    f"Replaced {len(replacements)} occurrence(s) with long hex: {source_long}\n"
-                    "=============================="
-                )
-                print(Fore.GREEN + "✅ " + log_entry)
-                log_msgs.append(log_entry)
-                modified_files.append(os.path.basename(file_path))
+            buffers[file_name] = read_file_bytes(read_paths.get(file_name, file_path))
+            paths[file_name] = file_path
         except Exception as e:
-            print(Fore.RED + f"❌ Error processing file '{os.path.basename(file_path)}': {e}")
-    if total_replacements > 0:
-        return log_msgs, modified_files
-    else:
-        print(Fore.YELLOW + f"⚠️ [Gun Skins] No valid occurrences of target hex '{target_hex}' found in any file.")
-        return None, []
+            print(Fore.RED + f"❌ Error reading file '{file_name}': {e}")
+    log_msgs, modified_files = patch_gun_skin_buffers(buffers, source_hex, target_hex, source_gun, target_gun,
+                                                      source_paths, long_hex_cache)
+    for file_name in modified_files:
+        try:
+            write_file_bytes(paths[file_name], buffers[file_name])
+        except Exception as e:
+            print(Fore.RED + f"❌ Error processing file '{file_name}': {e}")
+    return log_msgs, modified_files
+
+def log_file_patch(mod_type, file_name, source_gun, target_gun, details):
+    log_entry = format_changelog_entry(mod_type, file_name, source_gun, target_gun, details)
+    print(Fore.GREEN + "✅ " + render_changelog_entry(log_entry))
+    return log_entry
 
 def mod_hit_effect_file(file_path, source_hex, target_hex, source_gun, target_gun):
-    global mod_counters
     try:
-        with open(file_path, "rb") as f:
-            data = f.read().hex()
-        if source_hex not in data:
-            return None
-        new_data = data.replace(source_hex, target_hex)
-        if new_data == data:
+        data = read_file_bytes(file_path)
+        data, details = patch_hex_swap(data, source_hex, target_hex)
+        if not details:
             return None
-        with open(file_path, "wb") as f:
-            f.write(bytes.fromhex(new_data))
-        mod_counters["Hit Effect"] += 1
-        log_entry = (
-            "==============================\n"
-            f"{mod_counters['Hit Effect']}. Mod Type: Hit Effect\n"
-            f"File: {os.path.basename(file_path)}\n"
-            f"Source Gun: {clean_gun_name_for_changelog(source_gun['name'])} \n"
-            f"Target Gun: {clean_gun_name_for_changelog(target_gun['name'])} \n"
-            f"Replaced hex: {source_hex} with {target_hex}\n"
-            "=============================="
-        )
-        print(Fore.GREEN + "✅ " + log_entry)
-        return log_entry
+        write_file_bytes(file_path, data)
+        return log_file_patch("Hit Effect", os.path.basename(file_path), source_gun, target_gun, details)
     except Exception as e:
         print(Fore.RED + f"❌ Error in Hit Effect mod for '{os.path.basename(file_path)}': {e}")
         return None
 
 def mod_lootbox_file(file_path, source_hex, target_hex, source_gun, target_gun):
-    global mod_counters
     try:
-        with open(file_path, "rb") as f:
-            data = f.read().hex()
-        if source_hex not in data:
+        data = read_file_bytes(file_path)
+        data, details = patch_hex_swap(data, source_hex, target_hex)
+        if not details:
             return None
-        new_data = data.replace(source_hex, target_hex)
-        if new_data == data:
-            return None
-        with open(file_path, "wb") as f:
-            f.write(bytes.fromhex(new_data))
-        mod_counters["Lootbox"] += 1
-        log_entry = (
-            "==============================\n"
-            f"{mod_counters['Lootbox']}. Mod Type: Lootbox\n"
-            f"File: {os.path.basename(file_path)}\n"
-            f"Source Gun: {clean_gun_name_for_changelog(source_gun['name'])} \n"
-            f"Target Gun: {clean_gun_name_for_changelog(target_gun['name'])} \n"
-            f"Replaced hex: {source_hex} with {target_hex}\n"
-            "=============================="
-        )
-        print(Fore.GREEN + "✅ " + log_entry)
-        return log_entry
+        write_file_bytes(file_path, data)
+        return log_file_patch("Lootbox", os.path.basename(file_path), source_gun, target_gun, details)
     except Exception as e:
         print(Fore.RED + f"❌ Error in Lootbox mod for '{os.path.basename(file_path)}': {e}")
         return None
 
 def mod_icon_file(file_path, source_hex, target_hex, source_index_hex, target_index_hex, source_gun, target_gun):
-    global mod_counters
     try:
-        with open(file_path, "rb") as f:
-            data = f.read().hex()
-        if source_hex not in data:
-            return None
-        intervals = []
-        for match in re.finditer(re.escape(source_hex), data):
-            pos = match.start()
-            start_interval = max(0, pos - 100)
-            intervals.append((start_interval, pos))
-        def replace_index_if_in_zone(match):
-            pos = match.start()
-            for start, end in intervals:
-                if start <= pos < end:
-                    return target_index_hex
-            return match.group(0)
-        new_data = re.sub(re.escape(source_index_hex), replace_index_if_in_zone, data)
-        new_data = new_data.replace(source_hex, target_hex)
-        if new_data == data:
+        data = read_file_bytes(file_path)
+        data, details = patch_icon(data, source_hex, target_hex, source_index_hex, target_index_hex)
+        if not details:
             return None
-        with open(file_path, "wb") as f:
-            f.write(bytes.fromhex(new_data))
-        mod_counters["Icon"] += 1
-        log_entry = (
-            "==============================\n"
-            f"{mod_counters['Icon']}. Mod Type: Icon\n"
-            f"File: {os.path.basename(file_path)}\n"
-            f"Source Gun: {clean_gun_name_for_changelog(source_gun['name'])} \n"
-            f"Target Gun: {clean_gun_name_for_changelog(target_gun['name'])} \n"
-            f"Source Index: {source_index_hex}\n"
-            f"Target Index: {target_index_hex}\n"
-            f"Replaced hex: {source_hex} with {target_hex}\n"
-            "=============================="
-        )
-        print(Fore.GREEN + "✅ " + log_entry)
-        return log_entry
+        write_file_bytes(file_path, data)
+        return log_file_patch("Icon", os.path.basename(file_path), source_gun, target_gun, details)
     except Exception as e:
         print(Fore.RED + f"❌ Error in Icon mod for '{os.path.basename(file_path)}': {e}")
         return None
 
 # ===============================
-# Bulk Modding Function
+# Per-File Patching (serial or process pool)
 # ===============================
-def bulk_modding(guns, dirs, skin_index_dict):
+# Changelog section name for each staged mod type
+MOD_LABELS = {"gun_skins": "Gun Skins", "hit_effect": "Hit Effect", "lootbox": "Lootbox", "icon": "Icon"}
+
+def make_job(source_gun, target_gun, source_hex_hit, target_hex_hit, skin_index_dict):
+    """Everything a staged file needs to apply one SOURCE -> TARGET pair."""
+    return {
+        "source_gun": source_gun,
+        "target_gun": target_gun,
+        "source_hex": source_gun["hex"],
+        "target_hex": target_gun["hex"],
+        "source_hex_hit": source_hex_hit,
+        "target_hex_hit": target_hex_hit,
+        "source_index": get_skin_index_for_gun(skin_index_dict, source_gun["name"]),
+        "target_index": get_skin_index_for_gun(skin_index_dict, target_gun["name"]),
+    }
+
+def apply_job(data, mod_type, job):
+    """Apply one job to a Hit Effect / Lootbox / Icon buffer. Returns (data, details or None)."""
+    if mod_type == "hit_effect":
+        return patch_hex_swap(data, job["source_hex_hit"], job["target_hex_hit"])
+    if mod_type == "lootbox":
+        return patch_hex_swap(data, job["source_hex"], job["target_hex"])
+    if mod_type == "icon":
+        if job["source_index"] is None or job["target_index"] is None:
+            return data, None
+        return patch_icon(data, job["source_hex"], job["target_hex"], job["source_index"], job["target_index"])
+    return data, None
+
+def patch_staged_file(task):
+    """
+    Patch one staged file with its jobs: one read, one write if anything changed.
+    task = (file_name, read_path, write_path, mod_type, [(job_pos, job), ...]).
+    Returns (file_name, [(job_pos, details)], error). Runs in worker processes,
+    so it only returns changelog details; numbering happens in the parent.
+    The patched bytes go to write_path + ".part"; run_file_tasks moves them
+    into place once the result is back, so read_path is never half-written.
+    """
+    file_name, read_path, write_path, mod_type, jobs = task
+    events = []
+    try:
+        data = read_file_bytes(read_path)
+        for job_pos, job in jobs:
+            data, details = apply_job(data, mod_type, job)
+            if details:
+                events.append((job_pos, details))
+        if events:
+            write_file_bytes(write_path + ".part", data)
+    except Exception as e:
+        return file_name, events, str(e)
+    return file_name, events, None
+
+def commit_file_task(task, result):
+    """Move a finished task's .part file over its write path (see patch_staged_file)."""
+    file_name, events, error = result
+    write_path = task[2]
+    try:
+        if events and error is None:
+            os.replace(write_path + ".part", write_path)
+        elif os.path.exists(write_path + ".part"):
+            os.remove(write_path + ".part")
+    except OSError as e:
+        return file_name, [], str(e)
+    return result
+
+def run_file_tasks(tasks, workers=0):
+    """
+    Run patch_staged_file over tasks, in a ProcessPoolExecutor when workers > 1.
+    Results come back in task order either way, so merging stays deterministic.
+    Falls back to serial where process pools are unavailable (e.g. Termux) or
+    break (a worker killed by the low-memory killer). Only tasks whose result
+    never came back are run again; their repack copy was not replaced yet, so
+    the retry starts from the same bytes.
+    """
+    results = [None] * len(tasks)
+    if workers and workers > 1 and len(tasks) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(patch_staged_file, task) for task in tasks]
+                for i, future in enumerate(futures):
+                    try:
+                        results[i] = commit_file_task(tasks[i], future.result())
+                    except BrokenProcessPool:
+                        pass
+        except (ImportError, NotImplementedError, OSError, BrokenProcessPool) as e:
+            print(Fore.YELLOW + f"⚠️ Process pool unavailable ({e}). Patching serially.")
+        else:
+            remaining = results.count(None)
+            if remaining:
+                print(Fore.YELLOW + f"⚠️ Process pool stopped early. Patching the {remaining} remaining file(s) serially.")
+    for i, task in enumerate(tasks):
+        if results[i] is None:
+            results[i] = commit_file_task(task, patch_staged_file(task))
+    return results
+
+# ===============================
+# Bulk Planner
+# ===============================
+def resolve_hit_effect_hexes(guns, source_gun, target_gun):
+    """
+    Hexes used for Hit Effect modding: a 'Default' target swaps to its
+    'Hit effect' variant, a levelled source uses its '(Lv. 5)' hex.
+    """
+    target_hex_hit = target_gun["hex"]
+    if target_gun["name"].startswith("Default"):
+        hit_effect_gun = guns.hit_effect_variant(target_gun)
+        if hit_effect_gun:
+            print(Fore.GREEN + f"✅ Target gun is 'Default'. Using Hit Effect version: {decorate_gun_name(hit_effect_gun)}")
+            target_hex_hit = hit_effect_gun["hex"]
+        else:
+            print(Fore.YELLOW + f"⚠️ Could not find Hit Effect version for '{target_gun['name']}'. Using Default version.")
+    return source_hex_for_hit_effect(guns, source_gun), target_hex_hit
+
+def source_hex_for_hit_effect(guns, source_gun):
+    source_hex_hit = source_gun["hex"]
+    if "Lv." in source_gun["name"]:
+        level5_gun = guns.level5_variant(source_gun)
+        if level5_gun:
+            source_hex_hit = level5_gun["hex"]
+            print(Fore.GREEN + f"✅ Using level 5 hex for Hit Effect modding: {source_hex_hit}")
+    return source_hex_hit
+
+def plan_bulk_pairs(pairs, guns, skin_index_dict):
+    """
+    Resolve every SOURCE_ID,TARGET_ID pair up front into a job holding all the
+    hexes each mod type needs (plain, Hit Effect and icon index).
+    Unknown IDs and malformed hexes are reported and dropped here.
+    """
+    jobs = []
+    for source_id, target_id in pairs:
+        source_gun = guns.find_by_id(source_id)
+        target_gun = guns.find_by_id(target_id)
+        if not source_gun:
+            print(Fore.RED + f"❌ Source gun with ID {source_id} not found. Skipping pair.")
+            continue
+        if not target_gun:
+            print(Fore.RED + f"❌ Target gun with ID {target_id} not found. Skipping pair.")
+            continue
+        source_hex_hit, target_hex_hit = resolve_hit_effect_hexes(guns, source_gun, target_gun)
+        job = make_job(source_gun, target_gun, source_hex_hit, target_hex_hit, skin_index_dict)
+        try:
+            for key in ("source_hex", "target_hex", "source_hex_hit", "target_hex_hit", "source_index", "target_index"):
+                if job[key] is not None:
+                    hex_to_bytes(job[key])
+        except ValueError as e:
+            print(Fore.RED + f"❌ Invalid hex for pair {source_id},{target_id}: {e}. Skipping pair.")
+            continue
+        jobs.append(job)
+    return jobs
+
+def schedule_bulk_staging(jobs, hex_index, pending):
+    """
+    Work out, without opening source dats, when each file joins the repack folder.
+    A file is staged by the first job whose source/target hex it holds: source
+    files through the hex index, earlier repack copies (pending: {mod: {file: set of
+    the jobs' hexes they hold}}) by their current content. Returns {file_name: {"mod", "job", "existing"}}
+    in staging order; "existing" means the repack copy is the starting point.
+    """
+    schedule = {}
+    for job_pos, job in enumerate(jobs):
+        condition_hexes = [job["source_hex"], job["target_hex"]]
+        try:
+            condition_bytes = [hex_to_bytes(hex_val) for hex_val in condition_hexes]
+        except ValueError as e:
+            print(Fore.RED + f"❌ Invalid hex in guns.txt ({', '.join(condition_hexes)}): {e}. Skipping pair.")
+            continue
+        for mod in MOD_TYPES:
+            if mod not in hex_index:
+                continue
+            mod_index = hex_index[mod]
+            mod_pending = pending.get(mod, {})
+            candidates = set(lookup_candidate_files(mod_index, condition_hexes))
+            for file_name in sorted(candidates | set(mod_pending), key=mod_index["position"].get):
+                if file_name in schedule:
+                    continue
+                present = mod_pending.get(file_name)
+                if present is not None and any(hex_bytes in present for hex_bytes in condition_bytes):
+                    schedule[file_name] = {"mod": mod, "job": job_pos, "existing": True}
+                elif file_name in candidates:
+                    schedule[file_name] = {"mod": mod, "job": job_pos, "existing": False}
+    return schedule
+
+def execute_bulk_plan(jobs, dirs, hex_index, workers=0):
+    """
+    Apply all planned jobs, reading and writing each staged file once.
+
+    Hit Effect, Lootbox and Icon files are independent of each other and are
+    patched by run_file_tasks (optionally in parallel). Gun skins share the
+    extracted long hex across files, so they are patched serially here. Results
+    are merged job by job in staging order before changelog numbers are given
+    out, so the changelog matches a serial run exactly.
+    Returns the changelog entries.
+    """
     repack_folder = dirs["repack"]
     global_changelog = []
-    # Use one file_modtype_map for the entire bulk session
-    file_modtype_map = {}
+
+    # Copies left in the repack folder by an earlier session become the starting
+    # point of a file as soon as one of the pairs touches a hex they contain.
+    # They are only scanned for the pairs' hexes here and read in full once staged.
+    job_hex_bytes = set()
+    for job in jobs:
+        for key in ("source_hex", "target_hex"):
+            try:
+                job_hex_bytes.add(hex_to_bytes(job[key]))
+            except ValueError:
+                pass  # reported and skipped by schedule_bulk_staging
+    pending = {}
+    for file_name in os.listdir(repack_folder):
+        file_path = os.path.join(repack_folder, file_name)
+        owner = next((mod for mod in MOD_TYPES if mod in hex_index and file_name in hex_index[mod]["position"]), None)
+        if owner is None or not os.path.isfile(file_path):
+            continue
+        try:
+            pending.setdefault(owner, {})[file_name] = find_patterns_in_file(file_path, job_hex_bytes)
+        except Exception:
+            pass
+    schedule = schedule_bulk_staging(jobs, hex_index, pending)
+
+    def read_path(file_name, staged):
+        if staged["existing"]:
+            return os.path.join(repack_folder, file_name)
+        return os.path.join(dirs[staged["mod"]], file_name)
+
+    tasks = []
+    for file_name, staged in schedule.items():
+        if staged["mod"] == "gun_skins":
+            continue
+        file_jobs = [(job_pos, jobs[job_pos]) for job_pos in range(staged["job"], len(jobs))]
+        tasks.append((file_name, read_path(file_name, staged), os.path.join(repack_folder, file_name),
+                      staged["mod"], file_jobs))
+    events_by_job = {}
+    for file_name, events, error in run_file_tasks(tasks, workers):
+        if error:
+            print(Fore.RED + f"❌ Error patching '{file_name}': {error}")
+        for job_pos, details in events:
+            events_by_job.setdefault(job_pos, []).append((file_name, details))
+
+    gun_skin_buffers = {}
+    gun_skin_modified = set()
+    long_hex_cache = {}
+    gun_skin_files = [(f, staged) for f, staged in schedule.items() if staged["mod"] == "gun_skins"]
+    for job_pos, job in enumerate(jobs):
+        source_gun = job["source_gun"]
+        target_gun = job["target_gun"]
+        print(Fore.YELLOW + f"\nProcessing pair: {decorate_gun_name(source_gun)}  ->  {decorate_gun_name(target_gun)}")
+        for file_name, staged in gun_skin_files:
+            if staged["job"] == job_pos:
+                try:
+                    gun_skin_buffers[file_name] = read_file_bytes(read_path(file_name, staged))
+                except Exception as e:
+                    print(Fore.RED + f"❌ Error reading '{file_name}' from gun_skins: {e}")
+        if gun_skin_buffers:
+            source_paths = gun_skin_source_paths(gun_skin_buffers, dirs["gun_skins"], hex_index, job["source_hex"])
+            log_msgs, mod_files = patch_gun_skin_buffers(gun_skin_buffers, job["source_hex"], job["target_hex"], source_gun, target_gun,
+                                                         source_paths, long_hex_cache)
+            if log_msgs:
+                global_changelog.extend(log_msgs)
+                gun_skin_modified.update(mod_files)
+        for file_name, details in events_by_job.get(job_pos, []):
+            mod_type = MOD_LABELS[schedule[file_name]["mod"]]
+            global_changelog.append(log_file_patch(mod_type, file_name, source_gun, target_gun, details))
+
+    for file_name in sorted(gun_skin_modified):
+        try:
+            write_file_bytes(os.path.join(repack_folder, file_name), gun_skin_buffers[file_name])
+        except Exception as e:
+            print(Fore.RED + f"❌ Error writing '{file_name}': {e}")
+    return global_changelog
+
+# ===============================
+# Bulk Modding Function
+# ===============================
+def parse_pair_line(line):
+    """'SOURCE_GUN_ID,TARGET_GUN_ID' -> (source_id, target_id), or None if malformed."""
+    parts = line.split(",")
+    if len(parts) != 2:
+        return None
+    return parts[0].strip(), parts[1].strip()
+
+def bulk_modding(guns, dirs, skin_index_dict):
     print(Fore.CYAN + "\n🔍 BULK MODDING MODE 🔍")
     print("Enter pairs of gun IDs in the format: SOURCE_GUN_ID,TARGET_GUN_ID")
     print("Enter 'q' on a new line when finished:")
@@ -403,94 +1338,37 @@ def bulk_modding(guns, dirs, skin_index_dict):
             break
         if not line:
             continue
-        parts = line.split(",")
-        if len(parts) != 2:
+        pair = parse_pair_line(line)
+        if pair is None:
             print(Fore.RED + "❌ Invalid format. Please use: SOURCE_GUN_ID,TARGET_GUN_ID")
             continue
-        pairs.append((parts[0].strip(), parts[1].strip()))
-    
-    # Process each pair; do not clear the repack folder between pairs.
-    for source_id, target_id in pairs:
-        source_gun = next((g for g in guns if g["id"] == source_id), None)
-        target_gun = next((g for g in guns if g["id"] == target_id), None)
-        if not source_gun:
-            print(Fore.RED + f"❌ Source gun with ID {source_id} not found. Skipping pair.")
-            continue
-        if not target_gun:
-            print(Fore.RED + f"❌ Target gun with ID {target_id} not found. Skipping pair.")
-            continue
+        pairs.append(pair)
 
-        print(Fore.YELLOW + f"\nProcessing pair: {decorate_gun_name(source_gun)}  ->  {decorate_gun_name(target_gun)}")
-        source_hex = source_gun["hex"]
-        target_hex = target_gun["hex"]
-
-        target_hex_hit = target_hex
-        if target_gun["name"].startswith("Default"):
-            base_name = target_gun["name"].replace("Default", "").strip()
-            hit_effect_gun = next((gun for gun in guns if "Hit effect" in gun["name"] and base_name in gun["name"]), None)
-            if hit_effect_gun:
-                print(Fore.GREEN + f"✅ Target gun is 'Default'. Using Hit Effect version: {decorate_gun_name(hit_effect_gun)}")
-                target_hex_hit = hit_effect_gun["hex"]
-            else:
-                print(Fore.YELLOW + f"⚠️ Could not find Hit Effect version for '{target_gun['name']}'. Using Default version.")
-
-        source_hex_hit = source_hex
-        if "Lv." in source_gun["name"]:
-            base_name = source_gun["name"].split(" (Lv.")[0].strip()
-            for gun in guns:
-                if base_name in gun["name"] and "(Lv. 5)" in gun["name"]:
-                    source_hex_hit = gun["hex"]
-                    print(Fore.GREEN + f"✅ Using level 5 hex for Hit Effect modding: {source_hex_hit}")
-                    break
+    run_bulk_pairs(pairs, guns, dirs, skin_index_dict)
+    print(Fore.GREEN + "\n👋 Bulk modding complete. Returning to mode selection...\n")
 
-        # In bulk modding, copy files only if not already present with required hex codes.
-        mod_types = ["gun_skins", "hit_effect", "lootbox", "icon"]
-        for mod in mod_types:
-            src_dir = dirs.get(mod)
-            if not src_dir or not os.path.exists(src_dir):
-                print(Fore.RED + f"❌ Directory for {mod} not found. Skipping.")
-                continue
-            copy_files_to_repack_mod(mod, src_dir, repack_folder, [source_hex, target_hex], file_modtype_map)
+def run_bulk_pairs(pairs, guns, dirs, skin_index_dict):
+    """
+    Bulk engine shared by the interactive and headless modes: plan, patch,
+    prune the repack folder and write changelog.txt.
+    Returns (jobs, changelog entries).
+    """
+    repack_folder = dirs["repack"]
+    os.makedirs(repack_folder, exist_ok=True)
+    for mod in MOD_TYPES:
+        src_dir = dirs.get(mod)
+        if not src_dir or not os.path.exists(src_dir):
+            print(Fore.RED + f"❌ Directory for {mod} not found. Skipping.")
 
-        modified_files = set()
-        gun_skin_files = [os.path.join(repack_folder, f) for f, mod in file_modtype_map.items() if mod == "gun_skins"]
-        if gun_skin_files:
-            log_msgs, mod_files = revert_mod_gun_skin_files(gun_skin_files, source_hex, target_hex, source_gun, target_gun)
-            if log_msgs:
-                global_changelog.extend(log_msgs)
-                modified_files.update(mod_files)
+    # Plan every pair first, then patch each staged file with one read and one write.
+    jobs = plan_bulk_pairs(pairs, guns, skin_index_dict)
+    hex_index = build_hex_index(guns, dirs)
+    global_changelog = execute_bulk_plan(jobs, dirs, hex_index, dirs.get("workers", 0))
 
-        for file_name in os.listdir(repack_folder):
-            file_path = os.path.join(repack_folder, file_name)
-            if not os.path.isfile(file_path):
-                continue
-            if file_modtype_map.get(file_name) == "gun_skins":
-                continue
-            mod_type = file_modtype_map.get(file_name)
-            log_entry = None
-            if mod_type == "hit_effect":
-                log_entry = mod_hit_effect_file(file_path, source_hex_hit, target_hex_hit, source_gun, target_gun)
-            elif mod_type == "lootbox":
-                log_entry = mod_lootbox_file(file_path, source_hex, target_hex, source_gun, target_gun)
-            elif mod_type == "icon":
-                target_skin_index = get_skin_index_for_gun(skin_index_dict, target_gun["name"])
-                source_skin_index = get_skin_index_for_gun(skin_index_dict, source_gun["name"])
-                if target_skin_index is None or source_skin_index is None:
-                    continue
-                log_entry = mod_icon_file(file_path, source_hex, target_hex, source_skin_index, target_skin_index, source_gun, target_gun)
-            if log_entry:
-                global_changelog.append(log_entry)
-                modified_files.add(file_name)
-    
-    # After processing all pairs, clean up the repack folder:
-    # Keep only files that are present in the changelog.
-    changelog_files = set()
-    for entry in global_changelog:
-        match = re.search(r"File:\s*(.+)", entry)
-        if match:
-            changelog_files.add(match.group(1).strip())
+    # Clean up the repack folder: keep only files that are present in the changelog.
+    changelog_files = set(index_journal(global_changelog)["by_file"])
     for file_name in os.listdir(repack_folder):
-        if file_name == "changelog.txt":
+        if file_name in (CHANGELOG_FILE, JOURNAL_FILE):
             continue
         file_path = os.path.join(repack_folder, file_name)
         if not os.path.isfile(file_path):
@@ -501,59 +1379,79 @@ def bulk_modding(guns, dirs, skin_index_dict):
             except Exception:
                 pass
     
-    changelog_path = os.path.join(repack_folder, "changelog.txt")
     if global_changelog:
         try:
-            with open(changelog_path, "w", encoding="utf-8") as f:
-                f.write("\n\n".join(global_changelog))
+            write_journal(repack_folder, global_changelog)
+            changelog_path = render_changelog(repack_folder, global_changelog)
             print(Fore.GREEN + "\n🎉 Bulk modding complete. Changelog saved at:")
             print(f"   {changelog_path}\n")
         except Exception as e:
             print(Fore.RED + f"❌ Error writing changelog: {e}")
     else:
         print(Fore.YELLOW + "\n⚠️ No changes were made in bulk modding.")
-    
-    print(Fore.GREEN + "\n👋 Bulk modding complete. Returning to mode selection...\n")
+    return jobs, global_changelog
 
 # ===============================
 # Normal Modding Function
 # ===============================
-def normal_modding(guns, dirs, skin_index_dict):
+def new_normal_session(guns, dirs):
+    """
+    State kept across Normal mode swaps, so a new pair only touches the files
+    it affects: the changelog rows, the files present in the repack folder
+    ("staged") and the source hex index. The repack folder is listed and pruned
+    of files missing from the changelog once, here.
+    """
     repack_folder = dirs["repack"]
-    global_changelog = []
     if not os.path.exists(repack_folder):
         os.makedirs(repack_folder, exist_ok=True)
-    file_modtype_map = {}
-    while True:
-        changelog_path = os.path.join(repack_folder, "changelog.txt")
-        if os.path.exists(changelog_path):
+    changelog = load_journal(repack_folder)
+    changelog_files = set(index_journal(changelog)["by_file"])
+    staged = set()
+    for file_name in os.listdir(repack_folder):
+        file_path = os.path.join(repack_folder, file_name)
+        if file_name in (CHANGELOG_FILE, JOURNAL_FILE) or not os.path.isfile(file_path):
+            continue
+        if file_name not in changelog_files:
             try:
-                with open(changelog_path, "r", encoding="utf-8") as f:
-                    global_changelog = f.read().split("\n\n")
-            except Exception as e:
-                print(Fore.RED + f"❌ Error reading changelog: {e}")
-                global_changelog = []
-        else:
-            global_changelog = []
-    
-        changelog_files = set()
-        for entry in global_changelog:
-            match = re.search(r"File:\s*(.+)", entry)
-            if match:
-                file_name = match.group(1).strip()
-                changelog_files.add(file_name)
-    
-        for file_name in os.listdir(repack_folder):
-            file_path = os.path.join(repack_folder, file_name)
-            if file_name == "changelog.txt":
+                os.remove(file_path)
                 continue
-            if file_name not in changelog_files and os.path.isfile(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    pass
+            except Exception:
+                pass
+        staged.add(file_name)
+    return {
+        "repack": repack_folder,
+        "changelog": changelog,
+        "changelog_files": changelog_files,
+        # changelog.txt holds this many rows of "changelog" (None until rendered this session)
+        "rendered": None,
+        "staged": staged,
+        "file_modtype_map": {},
+        # Files staged for the current pair but not written yet: {file_name: source path}
+        "overlay": {},
+        "hex_index": build_hex_index(guns, dirs),
+        # Gun skin long hexes read from unmodified source files, see extract_long_hex
+        "long_hex_cache": {},
+    }
+
+def normal_modding(guns, dirs, skin_index_dict):
+    session = new_normal_session(guns, dirs)
+    repack_folder = session["repack"]
+    global_changelog = session["changelog"]
+    file_modtype_map = session["file_modtype_map"]
+    staged = session["staged"]
+    overlay = session["overlay"]
+    while True:
+        new_entries = []
+        # Only files staged earlier this session can be missing from the changelog.
+        for file_name in sorted(staged - session["changelog_files"]):
+            try:
+                os.remove(os.path.join(repack_folder, file_name))
+                staged.discard(file_name)
+            except Exception:
+                pass
     
         file_modtype_map.clear()
+        overlay.clear()
     
         while True:
             print(Fore.CYAN + "\n🔍 Select Source and Target Guns 🔍\n")
@@ -592,8 +1490,7 @@ def normal_modding(guns, dirs, skin_index_dict):
     
             target_hex_hit = target_hex
             if target_gun["name"].startswith("Default"):
-                base_name = target_gun["name"].replace("Default", "").strip()
-                hit_effect_gun = next((gun for gun in guns if "Hit effect" in gun["name"] and base_name in gun["name"]), None)
+                hit_effect_gun = guns.hit_effect_variant(target_gun)
                 if hit_effect_gun:
                     print(Fore.GREEN + f"✅ Target gun is 'Default'. Using Hit Effect version: {decorate_gun_name(hit_effect_gun)} ({hit_effect_gun['hex']})")
                     target_hex_hit = hit_effect_gun["hex"]
@@ -604,70 +1501,59 @@ def normal_modding(guns, dirs, skin_index_dict):
             print(Fore.GREEN + f"🔍 Selected Target: {decorate_gun_name(target_gun)} \n")
             break
     
-        source_hex_hit = source_hex
-        if "Lv." in source_gun["name"]:
-            base_name = source_gun["name"].split(" (Lv.")[0].strip()
-            for gun in guns:
-                if base_name in gun["name"] and "(Lv. 5)" in gun["name"]:
-                    source_hex_hit = gun["hex"]
-                    print(Fore.GREEN + f"✅ Using level 5 hex for Hit Effect modding: {source_hex_hit}")
-                    break
+        source_hex_hit = source_hex_for_hit_effect(guns, source_gun)
     
-        mod_types = ["gun_skins", "hit_effect", "lootbox", "icon"]
-        for mod in mod_types:
+        for mod in MOD_TYPES:
             src_dir = dirs.get(mod)
             if not src_dir or not os.path.exists(src_dir):
                 print(Fore.RED + f"❌ Directory for {mod} not found. Skipping.")
                 continue
-            copy_files_to_repack_mod(mod, src_dir, repack_folder, [source_hex, target_hex], file_modtype_map)
+            copy_files_to_repack_mod(mod, src_dir, repack_folder, [source_hex, target_hex], file_modtype_map,
+                                     session["hex_index"], staged, overlay)
     
         modified_files = set()
     
         gun_skin_files = [os.path.join(repack_folder, f) for f, mod in file_modtype_map.items() if mod == "gun_skins"]
         if gun_skin_files:
-            log_msgs, mod_files = revert_mod_gun_skin_files(gun_skin_files, source_hex, target_hex, source_gun, target_gun)
+            source_paths = gun_skin_source_paths([os.path.basename(f) for f in gun_skin_files], dirs["gun_skins"],
+                                                 session["hex_index"], source_hex)
+            log_msgs, mod_files = revert_mod_gun_skin_files(gun_skin_files, source_hex, target_hex, source_gun, target_gun,
+                                                            overlay, source_paths, session["long_hex_cache"])
             if log_msgs:
-                global_changelog.extend(log_msgs)
+                new_entries.extend(log_msgs)
                 modified_files.update(mod_files)
     
-        for file_name in os.listdir(repack_folder):
-            file_path = os.path.join(repack_folder, file_name)
-            if not os.path.isfile(file_path):
-                continue
-            if file_modtype_map.get(file_name) == "gun_skins":
+        job = make_job(source_gun, target_gun, source_hex_hit, target_hex_hit, skin_index_dict)
+        tasks = []
+        for file_name, mod_type in file_modtype_map.items():
+            if mod_type == "gun_skins":
                 continue
-            mod_type = file_modtype_map.get(file_name)
-            log_entry = None
-            if mod_type == "hit_effect":
-                log_entry = mod_hit_effect_file(file_path, source_hex_hit, target_hex_hit, source_gun, target_gun)
-            elif mod_type == "lootbox":
-                log_entry = mod_lootbox_file(file_path, source_hex, target_hex, source_gun, target_gun)
-            elif mod_type == "icon":
-                target_skin_index = get_skin_index_for_gun(skin_index_dict, target_gun["name"])
-                source_skin_index = get_skin_index_for_gun(skin_index_dict, source_gun["name"])
-                if target_skin_index is None or source_skin_index is None:
-                    continue
-                log_entry = mod_icon_file(file_path, source_hex, target_hex, source_skin_index, target_skin_index, source_gun, target_gun)
-            if log_entry:
-                global_changelog.append(log_entry)
+            tasks.append((file_name, overlay_read_path(overlay, repack_folder, file_name),
+                          os.path.join(repack_folder, file_name), mod_type, [(0, job)]))
+        for file_name, events, error in run_file_tasks(tasks, dirs.get("workers", 0)):
+            if error:
+                print(Fore.RED + f"❌ Error in {MOD_LABELS[file_modtype_map[file_name]]} mod for '{file_name}': {error}")
+            for _, details in events:
+                new_entries.append(log_file_patch(MOD_LABELS[file_modtype_map[file_name]], file_name, source_gun, target_gun, details))
                 modified_files.add(file_name)
-    
-        for file_name in os.listdir(repack_folder):
-            if file_name == "changelog.txt":
-                continue
-            file_path = os.path.join(repack_folder, file_name)
-            if not os.path.isfile(file_path):
-                continue
+
+        # Patched files now exist in the repack folder; untouched overlay entries never did.
+        staged.update(modified_files)
+        for file_name in sorted(staged):
             if file_name not in file_modtype_map or file_name not in modified_files:
                 try:
-                    os.remove(file_path)
+                    os.remove(os.path.join(repack_folder, file_name))
+                    staged.discard(file_name)
                 except Exception:
                     pass
     
+        global_changelog.extend(new_entries)
+        session["changelog_files"].update(row["file"] for row in new_entries)
         if global_changelog:
             try:
-                with open(changelog_path, "w", encoding="utf-8") as f:
-                    f.write("\n\n".join(global_changelog))
+                write_journal(repack_folder, new_entries, append=True)
+                changelog_path = render_changelog(repack_folder, global_changelog, session["rendered"])
+                session["rendered"] = len(global_changelog)
                 print(Fore.GREEN + "\n🎉 Modding complete. Changelog saved at:")
                 print(f"   {changelog_path}\n")
             except Exception as e:
@@ -682,6 +1568,165 @@ def normal_modding(guns, dirs, skin_index_dict):
         else:
             print(Fore.CYAN + "🔄 Starting a new modding session...\n")
 
+# ===============================
+# Headless Batch Mode
+# ===============================
+def load_catalogs(dirs, txt_file=GUNS_FILE):
+    """Load guns.txt and the skin index. Returns (guns, skin_index_dict), or None if guns.txt is unusable."""
+    if not os.path.exists(txt_file):
+        print(Fore.RED + "❌ Error: 'guns.txt' not found at the specified location!")
+        return None
+    guns = read_guns_file(txt_file)
+    if not guns:
+        print(Fore.RED + "❌ No gun entries found in 'guns.txt'.")
+        return None
+    skin_index_path = dirs.get("skin_index")
+    skin_index_dict = new_skin_index()
+    if skin_index_path and os.path.exists(skin_index_path):
+        skin_index_dict = parse_skin_index_file(skin_index_path)
+    else:
+        print(Fore.RED + "❌ Skin Index file not found. Icon modding will not work properly.")
+    return guns, skin_index_dict
+
+def parse_job_spec(text):
+    """
+    Parse a batch job spec. Accepted forms:
+      - JSON list of pairs: [["SRC", "DST"], ...] or [{"source": "SRC", "target": "DST"}, ...]
+      - JSON object: {"pairs": [...], "dirs": {...}, "repack": "...", "guns": "...", "workers": N}
+      - CSV / plain text: one SOURCE_GUN_ID,TARGET_GUN_ID per line ('#' comments and a
+        source,target header line are ignored)
+    Returns (pairs, options dict, malformed line count).
+    """
+    stripped = text.lstrip()
+    if stripped.startswith(("[", "{")):
+        spec = json.loads(stripped)
+        options = {}
+        if isinstance(spec, dict):
+            options = {k: v for k, v in spec.items() if k != "pairs"}
+            spec = spec.get("pairs", [])
+        pairs = []
+        malformed = 0
+        for item in spec:
+            if isinstance(item, dict):
+                item = (item.get("source"), item.get("target"))
+            if not isinstance(item, (list, tuple)) or len(item) != 2 or None in item:
+                malformed += 1
+                continue
+            pairs.append((str(item[0]).strip(), str(item[1]).strip()))
+        return pairs, options, malformed
+
+    pairs = []
+    malformed = 0
+    for row in csv.reader(io.StringIO(text)):
+        if not row or not "".join(row).strip() or row[0].lstrip().startswith("#"):
+            continue
+        pair = parse_pair_line(",".join(row))
+        if pair is None:
+            malformed += 1
+            continue
+        if pair[0].lower() in ("source", "source_id") and pair[1].lower() in ("target", "target_id"):
+            continue
+        pairs.append(pair)
+    return pairs, {}, malformed
+
+def headless_modding(argv):
+    """
+    Non-interactive bulk run: read a job spec, run the bulk engine and print a
+    JSON summary on stdout (progress output goes to stderr).
+    Exit codes: 0 done, 1 bad job spec or setup error, 2 bad command line
+    (argparse usage error, reported before anything runs).
+    """
+    parser = argparse.ArgumentParser(description="Run GOATED bulk modding from a job spec without prompts.")
+    parser.add_argument("--pairs", default="-", help="pairs file (CSV/text or JSON); '-' reads stdin (default)")
+    parser.add_argument("--config", default=CONFIG_FILE, help="directories.json to start from")
+    parser.add_argument("--dir", action="append", default=[], metavar="KEY=PATH",
+                        help="override a directory key (gun_skins, hit_effect, lootbox, icon, skin_index)")
+    parser.add_argument("--repack", "--output", dest="repack", help="output (repack) folder")
+    parser.add_argument("--guns", help="guns.txt path")
+    parser.add_argument("--workers", type=int, help="processes for Hit Effect/Lootbox/Icon patching")
+    parser.add_argument("--summary", help="also write the JSON summary to this file")
+    args = parser.parse_args(argv)
+    dir_overrides = {}
+    for override in args.dir:
+        key, sep, path = override.partition("=")
+        if not sep:
+            parser.error(f"--dir expects KEY=PATH, got '{override}'")
+        dir_overrides[key.strip()] = path
+
+    started = time.perf_counter()
+    summary = {"status": "error"}
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            if args.pairs == "-":
+                text = sys.stdin.read()
+            else:
+                with open(args.pairs, "r", encoding="utf-8") as f:
+                    text = f.read()
+            pairs, options, malformed = parse_job_spec(text)
+        except (OSError, ValueError) as e:
+            summary["error"] = f"Could not read job spec: {e}"
+            pairs = None
+
+        try:
+            if pairs is not None:
+                dirs = get_directories()
+                if os.path.exists(args.config):
+                    try:
+                        with open(args.config, "r") as f:
+                            dirs.update(json.load(f))
+                    except (OSError, ValueError) as e:
+                        print(Fore.YELLOW + f"⚠️ Ignoring config '{args.config}': {e}")
+                dirs.update(options.get("dirs", {}))
+                for key in ("repack", "workers"):
+                    if key in options:
+                        dirs[key] = options[key]
+                dirs.update(dir_overrides)
+                if args.repack:
+                    dirs["repack"] = args.repack
+                if args.workers is not None:
+                    dirs["workers"] = args.workers
+                try:
+                    dirs["workers"] = parse_workers(dirs.get("workers", 0))
+                except ValueError as e:
+                    summary["error"] = str(e)
+                    pairs = None
+
+            if pairs is not None:
+                catalogs = load_catalogs(dirs, args.guns or options.get("guns", GUNS_FILE))
+                if catalogs is None:
+                    summary["error"] = "guns.txt missing or empty"
+                else:
+                    guns, skin_index_dict = catalogs
+                    jobs, global_changelog = run_bulk_pairs(pairs, guns, dirs, skin_index_dict)
+                    changed_files = sorted(index_journal(global_changelog)["by_file"])
+                    summary = {
+                        "status": "ok" if global_changelog else "no_changes",
+                        "pairs": len(pairs),
+                        "planned": len(jobs),
+                        "skipped": len(pairs) - len(jobs),
+                        "malformed": malformed,
+                        "entries": dict(mod_counters),
+                        "files": changed_files,
+                        "repack": dirs["repack"],
+                        "changelog": os.path.join(dirs["repack"], CHANGELOG_FILE) if global_changelog else None,
+                    }
+        except Exception as e:
+            summary = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_s"] = round(elapsed, 3)
+    if summary.get("pairs"):
+        summary["pairs_per_s"] = round(summary["pairs"] / elapsed, 2) if elapsed else None
+    report = json.dumps(summary, indent=2)
+    if args.summary:
+        try:
+            with open(args.summary, "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+        except OSError as e:
+            print(Fore.RED + f"❌ Error writing summary: {e}", file=sys.stderr)
+    print(report)
+    return 0 if summary["status"] != "error" else 1
+
 # ===============================
 # Main Function (Mode Selection)
 # ===============================
@@ -694,20 +1739,10 @@ def main():
     else:
         print(Fore.GREEN + "✅ Loaded saved directories from config.")
     
-    txt_file = "/storage/emulated/0/FILES_OBB/TXT/guns.txt"
-    if not os.path.exists(txt_file):
-        print(Fore.RED + "❌ Error: 'guns.txt' not found at the specified location!")
-        return
-    guns = read_guns_file(txt_file)
-    if not guns:
-        print(Fore.RED + "❌ No gun entries found in 'guns.txt'.")
+    catalogs = load_catalogs(dirs)
+    if catalogs is None:
         return
-    skin_index_path = dirs.get("skin_index")
-    skin_index_dict = {}
-    if skin_index_path and os.path.exists(skin_index_path):
-        skin_index_dict = parse_skin_index_file(skin_index_path)
-    else:
-        print(Fore.RED + "❌ Skin Index file not found. Icon modding will not work properly.")
+    guns, skin_index_dict = catalogs
     
     while True:
         print(Fore.CYAN + "\nSelect Modding Mode:")
@@ -726,4 +1761,7 @@ def main():
             print(Fore.RED + "❌ Invalid option. Please try again.")
 
 if __name__ == "__main__":
+    # Any command-line argument (e.g. --pairs jobs.csv) selects the headless batch mode
+    if len(sys.argv) > 1:
+        sys.exit(headless_modding(sys.argv[1:]))
     main()
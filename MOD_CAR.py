@@ -1,6 +1,7 @@
 import os
 import json
 from colorama import Fore, Style, init
+from fastcopy import copy_file, format_copy_rate
 
 # Initialize colorama
 init(autoreset=True)
@@ -10,6 +11,12 @@ TXT_DIR = "/storage/emulated/0/FILES_OBB/MOD_CAR/TXT/"
 DAT_DIR = "/storage/emulated/0/FILES_OBB/MOD_CAR/DATS/"
 REPACK_DIR = "/storage/emulated/0/FILES_OBB/REPACK_OBB/REPACK/"
 
+# Bulk modding also writes the .dat every N pairs (0 = only once at the end)
+CHECKPOINT_EVERY = 0
+
+# The swapped 2-byte field sits this many bytes before a vehicle's HEX
+OFFSET = 8
+
 def clear_screen():
     """Clear the terminal screen."""
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -97,42 +104,161 @@ def select_vehicle(vehicles, prompt):
         else:
             print(f"{Fore.RED}❌ Invalid option. Please choose 1, 2, or 3.{Style.RESET_ALL}")
 
-def modify_dat_file(source_dat, skin_hex, target_hex, revert=False):
+def load_catalog(txt_files):
+    """Vehicles of every .txt file (single mode can pick from any of them)."""
+    vehicles = []
+    for txt_file in txt_files:
+        vehicles.extend(load_vehicle_data(os.path.join(TXT_DIR, txt_file)))
+    return vehicles
+
+def build_offset_table(data, vehicles):
+    """
+    Scan the dat once for every catalog HEX.
+    Returns (offsets, absent): offsets maps hex -> (first position, original
+    2-byte field 8 bytes before it); absent lists the vehicles not in the dat.
+    """
+    offsets = {}
+    absent = []
+    seen = set()
+    for v in vehicles:
+        hex_code = v['hex']
+        if hex_code in seen:
+            continue
+        seen.add(hex_code)
+        try:
+            pos = data.find(bytes.fromhex(hex_code))
+        except ValueError:
+            pos = -1
+        # The field sits 8 bytes before the HEX; a match closer to the start has none.
+        if pos < OFFSET:
+            absent.append(v)
+            continue
+        offsets[hex_code] = (pos, bytes(data[pos-OFFSET : pos-OFFSET+2]))
+    return offsets, absent
+
+def report_offset_table(source_dat, offsets, absent):
+    """Print how many vehicles were indexed and which catalog vehicles are absent."""
+    print(f"{Fore.GREEN}✅ Indexed {len(offsets)} vehicles in {os.path.basename(source_dat)}.{Style.RESET_ALL}")
+    if absent:
+        print(f"{Fore.YELLOW}⚠️ {len(absent)} catalog vehicles are not in this .dat:{Style.RESET_ALL}")
+        for v in absent:
+            print(f"{Fore.YELLOW}   - {v['name']} ({v['hex']}){Style.RESET_ALL}")
+
+def load_offset_table(source_dat, vehicles):
+    """build_offset_table for a .dat on disk, reporting absent vehicles up front."""
+    try:
+        with open(source_dat, 'rb') as f:
+            data = f.read()
+    except Exception as e:
+        print(f"{Fore.RED}❌ Error reading .dat file: {e}{Style.RESET_ALL}")
+        return {}
+    offsets, absent = build_offset_table(data, vehicles)
+    report_offset_table(source_dat, offsets, absent)
+    return offsets
+
+def field_offset(offsets, hex_code):
+    """File offset of the 2-byte field of a vehicle in the offset table."""
+    return offsets[hex_code][0] - OFFSET
+
+def locate_vehicle(data, offsets, hex_code):
+    """
+    Offset table entry of a HEX. A HEX the table does not hold (not in any
+    catalog) is searched for in data once and added.
+    """
+    entry = offsets.get(hex_code)
+    if entry is None:
+        try:
+            pos = data.find(bytes.fromhex(hex_code))
+        except ValueError:
+            pos = -1
+        if pos >= OFFSET:
+            entry = offsets[hex_code] = (pos, bytes(data[pos-OFFSET : pos-OFFSET+2]))
+    return entry
+
+def apply_swap(data, skin_hex, target_hex, offsets):
+    """
+    Swap the 2-byte field 8 bytes before the skin HEX for the target's, in place
+    on a bytearray, using the positions in the offset table. Returns
+    (skin_original_hex, target_original_hex), or (None, None) when a HEX is missing.
+    """
+    skin_entry = locate_vehicle(data, offsets, skin_hex)
+    target_entry = locate_vehicle(data, offsets, target_hex)
+    if skin_entry is None or target_entry is None:
+        print(f"\n{Fore.RED}❌ ERROR: One or both HEX values not found in .dat file{Style.RESET_ALL}")
+        print(f"{Fore.RED}Missing: {'Skin HEX' if skin_entry is None else 'Target HEX'}{Style.RESET_ALL}")
+        return None, None
+    skin_pos = skin_entry[0]
+    target_pos = target_entry[0]
+    skin_original_bytes = bytes(data[skin_pos-OFFSET : skin_pos-OFFSET+2])
+    target_original_bytes = bytes(data[target_pos-OFFSET : target_pos-OFFSET+2])
+    print(f"\n{Fore.GREEN}🔄 Replacement: {Fore.YELLOW}{skin_original_bytes.hex()} ➡️ {target_original_bytes.hex()}{Style.RESET_ALL}")
+    data[skin_pos-OFFSET : skin_pos-OFFSET+2] = target_original_bytes
+    return skin_original_bytes.hex(), target_original_bytes.hex()
+
+def modify_dat_file(source_dat, skin_hex, target_hex, offsets):
     """Modify .dat file with proper offset handling."""
     try:
         with open(source_dat, 'rb') as f:
             data = bytearray(f.read())
-        skin_bytes = bytes.fromhex(skin_hex)
-        target_bytes = bytes.fromhex(target_hex)
-        skin_pos = data.find(skin_bytes)
-        target_pos = data.find(target_bytes)
-        if skin_pos == -1 or target_pos == -1:
-            print(f"\n{Fore.RED}❌ ERROR: One or both HEX values not found in .dat file{Style.RESET_ALL}")
-            print(f"{Fore.RED}Missing: {'Skin HEX' if skin_pos == -1 else 'Target HEX'}{Style.RESET_ALL}")
+        skin_original_hex, target_original_hex = apply_swap(data, skin_hex, target_hex, offsets)
+        if skin_original_hex is None:
             return None, None, None
-        offset = 8
-        try:
-            skin_original_bytes = data[skin_pos-offset : skin_pos-offset+2]
-            target_original_bytes = data[target_pos-offset : target_pos-offset+2]
-        except IndexError:
-            print(f"\n{Fore.RED}❌ ERROR: Invalid position calculation. HEX might be too close to start of file.{Style.RESET_ALL}")
-            return None, None, None
-        if revert:
-            print(f"\n{Fore.GREEN}🔄 Reverting: {Fore.YELLOW}{skin_original_bytes.hex()} ➡️ {target_original_bytes.hex()}{Style.RESET_ALL}")
-            data[skin_pos-offset : skin_pos-offset+2] = skin_original_bytes
-        else:
-            print(f"\n{Fore.GREEN}🔄 Replacement: {Fore.YELLOW}{skin_original_bytes.hex()} ➡️ {target_original_bytes.hex()}{Style.RESET_ALL}")
-            data[skin_pos-offset : skin_pos-offset+2] = target_original_bytes
         os.makedirs(REPACK_DIR, exist_ok=True)
         output_path = os.path.join(REPACK_DIR, os.path.basename(source_dat))
         with open(output_path, 'wb') as f:
             f.write(data)
         print(f"{Fore.GREEN}✅ Successfully saved modified file to: {Fore.YELLOW}{output_path}{Style.RESET_ALL}")
-        return output_path, skin_original_bytes.hex(), target_original_bytes.hex()
+        return output_path, skin_original_hex, target_original_hex
     except Exception as e:
         print(f"{Fore.RED}❌ Error modifying .dat file: {e}{Style.RESET_ALL}")
         return None, None, None
 
+def open_dat_session(source_dat, vehicles, checkpoint_every=0):
+    """
+    Load a .dat once for a series of swaps and index the catalog vehicles in it.
+    Swaps edit the in-memory copy and flush_dat_session writes it to the repack
+    folder; with checkpoint_every=N the file is also written after every N swaps.
+    """
+    with open(source_dat, 'rb') as f:
+        data = bytearray(f.read())
+    offsets, absent = build_offset_table(data, vehicles)
+    report_offset_table(source_dat, offsets, absent)
+    return {
+        'data': data,
+        'offsets': offsets,
+        'output_path': os.path.join(REPACK_DIR, os.path.basename(source_dat)),
+        'checkpoint_every': checkpoint_every,
+        'since_flush': 0,
+    }
+
+def session_swap(session, skin_hex, target_hex):
+    """modify_dat_file for a dat session. Returns (output_path, skin_original_hex, target_original_hex)."""
+    try:
+        skin_original_hex, target_original_hex = apply_swap(session['data'], skin_hex, target_hex, session['offsets'])
+    except Exception as e:
+        print(f"{Fore.RED}❌ Error modifying .dat file: {e}{Style.RESET_ALL}")
+        return None, None, None
+    if skin_original_hex is None:
+        return None, None, None
+    session['since_flush'] += 1
+    if session['checkpoint_every'] and session['since_flush'] >= session['checkpoint_every']:
+        flush_dat_session(session, checkpoint=True)
+    return session['output_path'], skin_original_hex, target_original_hex
+
+def flush_dat_session(session, checkpoint=False):
+    """Write the session's .dat to the repack folder. Returns False if it could not be written."""
+    try:
+        os.makedirs(REPACK_DIR, exist_ok=True)
+        with open(session['output_path'], 'wb') as f:
+            f.write(session['data'])
+        session['since_flush'] = 0
+        label = "Checkpoint saved to" if checkpoint else "Successfully saved modified file to"
+        print(f"{Fore.GREEN}✅ {label}: {Fore.YELLOW}{session['output_path']}{Style.RESET_ALL}")
+        return True
+    except Exception as e:
+        print(f"{Fore.RED}❌ Error saving .dat file: {e}{Style.RESET_ALL}")
+        return False
+
 def load_changes_history():
     """Load changes history from a JSON file."""
     history_file = "changes_history.json"
@@ -169,9 +295,8 @@ def fresh_start(dat_files):
     if os.path.exists(repack_dat):
         os.remove(repack_dat)
     try:
-        with open(original_dat, 'rb') as src, open(repack_dat, 'wb') as dst:
-            dst.write(src.read())
-        print(f"{Fore.GREEN}✅ Fresh start completed. Original .dat file copied to repack folder.{Style.RESET_ALL}")
+        copy_stats = copy_file(original_dat, repack_dat)
+        print(f"{Fore.GREEN}✅ Fresh start completed. Original .dat file copied to repack folder ({format_copy_rate(copy_stats)}).{Style.RESET_ALL}")
         return repack_dat
     except Exception as e:
         print(f"{Fore.RED}❌ Error performing fresh start: {e}{Style.RESET_ALL}")
@@ -192,7 +317,41 @@ def display_changes_summary(changes, title="SUMMARY OF CHANGES"):
               f"{Fore.MAGENTA}Change Details: {Fore.YELLOW}{change['original_skin_hex']} ➡️ {change['new_skin_hex']}{Style.RESET_ALL}\n")
     print(f"{Fore.GREEN}✅ All changes have been saved successfully.{Style.RESET_ALL}")
 
-def revert_changes(changes):
+def revert_file_changes(path, file_changes, offsets=None):
+    """
+    Undo changes of one .dat in a single open/patch/close, newest first: each
+    is a positioned write of its old bytes at its recorded offset. A change whose
+    bytes were overwritten since (by a later change that stays) is skipped.
+    History entries without an offset fall back to the offset table.
+    Returns (reverted changes, number of changes skipped); on an error the
+    changes not reached yet count as skipped.
+    """
+    reverted = []
+    try:
+        with open(path, 'r+b') as f:
+            for change in file_changes:
+                offset = change.get('offset')
+                if offset is None and offsets and change['skin_hex'] in offsets:
+                    offset = field_offset(offsets, change['skin_hex'])
+                if offset is None:
+                    print(f"{Fore.RED}❌ No offset recorded for {change['skin_name']}. Skipping.{Style.RESET_ALL}")
+                    continue
+                old_bytes = bytes.fromhex(change['original_skin_hex'])
+                new_bytes = bytes.fromhex(change['new_skin_hex'])
+                f.seek(offset)
+                current = f.read(len(new_bytes))
+                if current != new_bytes:
+                    print(f"{Fore.RED}❌ {change['skin_name']} was changed again since ({current.hex()} ≠ {new_bytes.hex()}). Skipping.{Style.RESET_ALL}")
+                    continue
+                f.seek(offset)
+                f.write(old_bytes)
+                print(f"{Fore.GREEN}🔄 Reverting: {Fore.YELLOW}{new_bytes.hex()} ➡️ {old_bytes.hex()}{Style.RESET_ALL}")
+                reverted.append(change)
+    except Exception as e:
+        print(f"{Fore.RED}❌ Error reverting {path}: {e}{Style.RESET_ALL}")
+    return reverted, len(file_changes) - len(reverted)
+
+def revert_changes(changes, offsets=None):
     """Allow the user to revert multiple changes by selecting numbers separated by commas."""
     while True:
         choice = input(f"\n{Fore.GREEN}Enter the numbers of the changes to revert (comma-separated, e.g., 1,2,3), or type 'q' to quit: {Style.RESET_ALL}").strip()
@@ -208,21 +367,28 @@ def revert_changes(changes):
         if not selected_indices:
             print(f"{Fore.RED}❌ No valid changes selected. Try again.{Style.RESET_ALL}")
             continue
-        reverted_changes = []
-        for idx in sorted(selected_indices, reverse=True):
+        # Newest first, grouped per file so each .dat is opened once.
+        by_file = {}
+        for idx in sorted(set(selected_indices), reverse=True):
             change_to_revert = changes[idx - 1]
             print(f"\n{Fore.CYAN}Reverting change: {Style.RESET_ALL}")
             print(f"{Fore.YELLOW}Skin: {change_to_revert['skin_name']} ({change_to_revert['skin_hex']}){Style.RESET_ALL}")
             print(f"{Fore.YELLOW}Target: {change_to_revert['target_name']} ({change_to_revert['target_hex']}){Style.RESET_ALL}")
             print(f"{Fore.MAGENTA}Change Details: {Fore.YELLOW}{change_to_revert['original_skin_hex']} ➡️ {change_to_revert['new_skin_hex']}{Style.RESET_ALL}")
-            modify_dat_file(change_to_revert['modified_file'], 
-                            change_to_revert['skin_hex'], 
-                            change_to_revert['target_hex'], 
-                            revert=True)
-            reverted_changes.append(change_to_revert)
-            del changes[idx - 1]
+            by_file.setdefault(change_to_revert['modified_file'], []).append(change_to_revert)
+        reverted_ids = set()
+        skipped = 0
+        for path, file_changes in by_file.items():
+            reverted, file_skipped = revert_file_changes(path, file_changes, offsets)
+            reverted_ids.update(id(c) for c in reverted)
+            skipped += file_skipped
+        reverted_changes = [c for c in changes if id(c) in reverted_ids]
+        changes[:] = [c for c in changes if id(c) not in reverted_ids]
         display_changes_summary(reverted_changes, title="REVERTED CHANGES")
-        print(f"{Fore.GREEN}✅ Changes reverted successfully.{Style.RESET_ALL}")
+        if skipped:
+            print(f"{Fore.YELLOW}⚠️ {len(reverted_changes)} change(s) reverted, {skipped} skipped and kept in the history.{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.GREEN}✅ Changes reverted successfully.{Style.RESET_ALL}")
         return True
 
 def bulk_modding(dat_files):
@@ -231,9 +397,10 @@ def bulk_modding(dat_files):
     Always starts fresh and uses the TXT file named ALL.txt.
     """
     clear_screen()
-    # Always perform a fresh start
-    dat_file = fresh_start(dat_files)
-    if dat_file is None:
+    # Always perform a fresh start: the original .dat is loaded into memory once
+    # and written to the repack folder after the last pair.
+    if not dat_files:
+        print(f"{Fore.RED}❌ Error: No .dat file found in the directory.{Style.RESET_ALL}")
         return
 
     # Use the fixed file ALL.txt from the TXT directory
@@ -244,6 +411,12 @@ def bulk_modding(dat_files):
         return
 
     vehicles = load_vehicle_data(all_txt_path)
+    try:
+        session = open_dat_session(dat_files[0], vehicles, CHECKPOINT_EVERY)
+    except Exception as e:
+        print(f"{Fore.RED}❌ Error performing fresh start: {e}{Style.RESET_ALL}")
+        return
+    print(f"{Fore.GREEN}✅ Fresh start completed. Original .dat file loaded for bulk modding.{Style.RESET_ALL}")
     
     # Gather bulk entries from user
     print(f"\n{Fore.CYAN}Enter bulk modding pairs (SOURCE ID, TARGET ID), one per line.{Style.RESET_ALL}")
@@ -278,7 +451,7 @@ def bulk_modding(dat_files):
         source_hex = source_vehicle['hex']
         target_hex = target_vehicle['hex']
         print(f"\n{Fore.CYAN}Processing: {source_vehicle['name']} ({source_hex}) -> {target_vehicle['name']} ({target_hex}){Style.RESET_ALL}")
-        modified_file, original_skin_hex, new_skin_hex = modify_dat_file(dat_file, source_hex, target_hex)
+        modified_file, original_skin_hex, new_skin_hex = session_swap(session, source_hex, target_hex)
         if modified_file:
             changes_made.append({
                 'skin_name': source_vehicle['name'],
@@ -286,12 +459,15 @@ def bulk_modding(dat_files):
                 'target_name': target_vehicle['name'],
                 'target_hex': target_hex,
                 'modified_file': modified_file,
+                'offset': field_offset(session['offsets'], source_hex),
                 'original_skin_hex': original_skin_hex,
                 'new_skin_hex': new_skin_hex
             })
-            # Update dat_file for subsequent changes
-            dat_file = modified_file
     
+    if not flush_dat_session(session):
+        print(f"{Fore.RED}❌ Bulk modding was not saved; the changes history was left as it was.{Style.RESET_ALL}")
+        input(f"\n{Fore.YELLOW}Press Enter to exit Bulk Modding...{Style.RESET_ALL}")
+        return
     display_changes_summary(changes_made)
     save_changes_history(changes_made)
     input(f"\n{Fore.YELLOW}Press Enter to exit Bulk Modding...{Style.RESET_ALL}")
@@ -336,6 +512,10 @@ def main():
         else:
             print(f"{Fore.RED}❌ Invalid choice. Try again.{Style.RESET_ALL}")
     
+    # Index every catalog vehicle once, in the original .dat: swaps and reverts
+    # then only touch the recorded positions.
+    offsets = load_offset_table(dat_files[0], load_catalog(txt_files))
+
     # Single modding loop
     while True:
         txt_file = display_txt_files(txt_files)
@@ -348,7 +528,7 @@ def main():
         print(f"{Fore.CYAN}=== TARGET VEHICLE ==={Style.RESET_ALL}")
         target_hex = select_vehicle(vehicles, "Choose vehicle to apply the skin to:")
         target_name = next((v['name'] for v in vehicles if v['hex'] == target_hex), "Unknown")
-        modified_file, original_skin_hex, new_skin_hex = modify_dat_file(dat_file, skin_hex, target_hex)
+        modified_file, original_skin_hex, new_skin_hex = modify_dat_file(dat_file, skin_hex, target_hex, offsets)
         if modified_file:
             changes_made.append({
                 'skin_name': skin_name,
@@ -356,6 +536,7 @@ def main():
                 'target_name': target_name,
                 'target_hex': target_hex,
                 'modified_file': modified_file,
+                'offset': field_offset(offsets, skin_hex),
                 'original_skin_hex': original_skin_hex,
                 'new_skin_hex': new_skin_hex
             })
@@ -371,7 +552,7 @@ def main():
             break
         if input(f"\n{Fore.GREEN}Would you like to revert any changes? (y/n): {Style.RESET_ALL}").lower() != 'y':
             break
-        if not revert_changes(changes_made):
+        if not revert_changes(changes_made, offsets):
             break
     
     save_changes_history(changes_made)
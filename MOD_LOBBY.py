@@ -70,46 +70,109 @@ def read_lobbies():
         print(colored("lobby.txt not found.", 'red'))
         return None
 
+# Function to find every anchor of several byte patterns, overlapping matches included
+def find_anchor_hits(data, patterns, start=0):
+    """
+    Return (offset, pattern number) for every occurrence of every pattern at
+    offset >= start, ascending by offset. Each distinct pattern is searched
+    with bytes.find over the data already read, and the offsets are merged;
+    patterns that are prefixes of each other are all reported.
+    """
+    offsets = {}
+    for pattern in set(patterns):
+        found = []
+        pos = data.find(pattern, start)
+        while pos != -1:
+            found.append(pos)
+            pos = data.find(pattern, pos + 1)
+        offsets[pattern] = found
+    if len(patterns) == 1:
+        return [(pos, 0) for pos in offsets[patterns[0]]]
+    return sorted((pos, number) for number, pattern in enumerate(patterns) for pos in offsets[pattern])
+
 # Function to replace the index in hex files
 def replace_index_in_files(hex_sequence, new_index):
+    replace_indexes_in_files([(hex_sequence, new_index, None)])
+
+# Function to apply several lobby themes in one pass over the files
+def replace_indexes_in_files(themes):
+    """
+    themes: list of (hex_sequence, new_index, name). Each distinct anchor is
+    located with one bytes.find pass over the file's data (find_anchor_hits);
+    the index byte 8 bytes before each anchor gets that theme's index. When two anchors share an index byte the
+    collision is reported and the theme listed last wins.
+    """
     try:
+        # Convert inputs to bytes
+        anchors = [bytes.fromhex(hex_sequence) for hex_sequence, _, _ in themes]
+        new_index_bytes = [bytes.fromhex(new_index) for _, new_index, _ in themes]
+        os.makedirs(RESULT_PATH, exist_ok=True)
+
         for filename in os.listdir(FILES_PATH):
             file_path = os.path.join(FILES_PATH, filename)
+            if not os.path.isfile(file_path):
+                continue
 
             with open(file_path, "rb") as file:
                 file_data = file.read()
 
-            # Convert inputs to bytes
-            new_index_bytes = bytes.fromhex(new_index)
-            hex_bytes = bytes.fromhex(hex_sequence)
+            # The index byte sits 8 bytes before each occurrence of a hex sequence
+            hits = find_anchor_hits(file_data, anchors, 8)
+            if not hits:
+                print(colored(f"No matching pattern found in {filename}.", 'yellow'))
+                continue
 
-            # Look for the pattern and replace the index
             updated_data = bytearray(file_data)
-            found = False
-
-            # Loop through the data to find the pattern starting from the last byte
-            for i in range(len(file_data) - len(hex_bytes), 7, -1):  # Start 8 bytes before the hex
-                # Check if the hex sequence matches at the current position
-                if file_data[i:i + len(hex_bytes)] == hex_bytes:
-                    # Extract the index byte 8 bytes before the hex sequence (starting from i-8)
-                    index_byte = file_data[i - 8]
-
-                    # Replace the found index with the new index
-                    updated_data[i - 8] = new_index_bytes[0]  # Replace the single byte index
-                    found = True
-
-                    print(colored(f"Modified {filename}: Replaced index {index_byte:02x} with {new_index} for hex sequence {hex_sequence}.", 'green'))
-
-            # Save the updated file
+            owners = {}
+            for i, number in reversed(hits):  # Report from the last match, as before
+                hex_sequence, new_index, name = themes[number]
+                index_byte = file_data[i - 8]
+                if i - 8 in owners:
+                    other = themes[owners[i - 8]]
+                    print(colored(f"Collision in {filename} at offset {i - 8:#x}: {other[2] or other[0]} and {name or hex_sequence} share an index byte; keeping {other[2] or other[0]}.", 'red'))
+                    continue
+                owners[i - 8] = number
+                updated_data[i - 8] = new_index_bytes[number][0]  # Replace the single byte index
+                label = f" ({name})" if name else ""
+                print(colored(f"Modified {filename}: Replaced index {index_byte:02x} with {new_index} for hex sequence {hex_sequence}{label}.", 'green'))
+
+            # Save only files that actually changed; others are left untouched in RESULT_PATH
+            if updated_data == file_data:
+                continue
             result_path = os.path.join(RESULT_PATH, filename)
             with open(result_path, "wb") as file:
                 file.write(updated_data)
-
-            if not found:
-                print(colored(f"No matching pattern found in {filename}.", 'yellow'))
     except Exception as e:
         print(colored(f"Error: {e}", 'red'))
 
+# Function to pick several lobbies, each with its own target index
+def select_lobby_themes(lobbies, def_index):
+    """Ask for lobby numbers (comma separated) and an index per lobby; Enter keeps the def.txt index."""
+    choices = input(colored("Select lobby themes by number (comma separated): ", 'magenta', attrs=['bold']))
+    themes = []
+    for part in choices.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            lobby_choice = int(part) - 1
+        except ValueError:
+            print(colored(f"Invalid input '{part}'. Skipping.", 'red'))
+            continue
+        if not 0 <= lobby_choice < len(lobbies):
+            print(colored(f"Invalid selection {part}. Skipping.", 'red'))
+            continue
+        lobby_hex, lobby_name = lobbies[lobby_choice]
+        index = input(colored(f"Index for {lobby_name} (Enter for def.txt index {def_index}): ", 'cyan')).strip() or def_index
+        try:
+            if len(bytes.fromhex(index)) != 1:
+                raise ValueError
+        except ValueError:
+            print(colored(f"Index must be one hex byte (e.g. 0a). Skipping {lobby_name}.", 'red'))
+            continue
+        themes.append((lobby_hex, index, lobby_name))
+    return themes
+
 # Main menu
 def main_menu():
     while True:
@@ -117,6 +180,7 @@ def main_menu():
         color_cycled_text("\nDARKSIDE")
         print(colored("1] MOD LOBBY", 'yellow', attrs=['bold']))
         print(colored("2] QUIT", 'green', attrs=['bold']))
+        print(colored("3] MOD MULTIPLE LOBBIES", 'cyan', attrs=['bold']))
         choice = input(colored("Choose an option: ", 'magenta', attrs=['bold']))
 
         if choice == "1":
@@ -147,6 +211,25 @@ def main_menu():
         elif choice == "2":
             print(colored("Exiting the program. Goodbye!", 'yellow'))
             break
+
+        elif choice == "3":
+            lobbies = read_lobbies()
+            def_index = read_def_index()
+
+            if not lobbies or not def_index:
+                print(colored("Required files or data missing.", 'red'))
+                continue
+
+            color_cycled_text("\nAvailable Lobbies:")
+            for i, (_, name) in enumerate(lobbies, 1):
+                print(colored(f"{i}. {name}", 'green'))
+
+            themes = select_lobby_themes(lobbies, def_index)
+            if not themes:
+                print(colored("No lobby themes selected.", 'red'))
+                continue
+            print(colored(f"Modding {len(themes)} lobby themes: {', '.join(name for _, _, name in themes)}", 'yellow'))
+            replace_indexes_in_files(themes)
         else:
             print(colored("Invalid choice. Please try again.", 'red'))
 
@@ -1,7 +1,11 @@
 import os
 import re
+import json
+import hashlib
 from colorama import Fore, Back, Style, init
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Initialize colorama
 init(autoreset=True)
@@ -13,39 +17,95 @@ ICON_MOD_DIR = r"/storage/emulated/0/FILES_OBB/ICON_MOD/"
 REPACK_OBB_DIR = r"/storage/emulated/0/FILES_OBB/REPACK_OBB/REPACKANYICON/"
 INDEX_FILE_PATH = os.path.join(TXT_DIR, "index.txt")
 CHANGELOG_PATH = os.path.join(REPACK_OBB_DIR, "changelog.txt")
+JOURNAL_PATH = os.path.join(REPACK_OBB_DIR, "changelog.jsonl")
+
+# Default answer to the processes prompt before patching ICON_MOD files (0 or 1 = one file at a time)
+WORKERS = 0
 
 # Global list to track changes
 changelog_entries = []
 
 # =========================== CHANGELOG ===========================
+def render_changelog_entry(entry):
+    """changelog.txt block for one journal row."""
+    lines = [
+        "==============================",
+        f"{entry['number']}. Mod Type: {entry['mod_type']}",
+        f"TXT USED: {entry['source_file']}",
+        f"File: {entry['file_name']}",
+        f"Source Item: {entry['source_item']}",
+        f"Target Item: {entry['target_item']}",
+        f"Replaced hex: {entry['source_hex']} with {entry['target_hex']}",
+    ]
+    if entry.get('index_occurrences', 0) > 0:
+        lines.append(f"Index replaced: {entry['source_index']} with {entry['target_index']} ({entry['index_occurrences']} occurrence(s))")
+    elif entry.get('index_failure_reason'):
+        lines.append(f"Index replacement failed: {entry['index_failure_reason']}")
+    lines.append("==============================")
+    return "\n".join(lines) + "\n\n"
+
+CHANGELOG_HEADER = "🌟 Mod Tool Changelog 🌟\n==============================\n\n"
+
+def changelog_digest():
+    """sha256 of changelog.txt, or None when it does not exist."""
+    try:
+        with open(CHANGELOG_PATH, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def load_journal():
+    """Journal rows behind changelog.txt. The journal is only trusted when its last
+    {"changelog_sha256"} stamp matches changelog.txt; otherwise (no journal yet,
+    or changelog.txt edited or deleted since) it is rebuilt from changelog.txt,
+    whose blocks are carried over verbatim as {"text": block} rows."""
+    digest = changelog_digest()
+    if os.path.exists(JOURNAL_PATH):
+        rows = []
+        stamps = []
+        try:
+            with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    if "changelog_sha256" in row:
+                        stamps.append(row["changelog_sha256"])
+                    else:
+                        rows.append(row)
+        except (OSError, ValueError):
+            stamps = []
+        if stamps and stamps[-1] == digest:
+            return rows
+    if digest is None:
+        return []
+    with open(CHANGELOG_PATH, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.startswith(CHANGELOG_HEADER):
+        text = text[len(CHANGELOG_HEADER):]
+    return [{"text": block.strip("\n")} for block in text.split("\n\n") if block.strip()]
+
 def write_changelog():
-    """Writes accumulated changes to changelog.txt.
-    Each log entry shows the mod replacement along with the TXT file used and,
-    if applicable, the index replacement details or failure reason."""
+    """Writes accumulated changes to the changelog.jsonl journal, then renders
+    changelog.txt from the whole journal. Each entry becomes one JSON row
+    (numbered per mod type): the mod replacement, the TXT file used and, if
+    applicable, the index replacement details or failure reason. The journal
+    ends with a stamp of the changelog.txt it was rendered to."""
     mod_type_counts = {}
-    file_exists = os.path.exists(CHANGELOG_PATH)
-    with open(CHANGELOG_PATH, "a", encoding="utf-8") as f:
-        if not file_exists:
-            f.write("🌟 Mod Tool Changelog 🌟\n")
-            f.write("==============================\n\n")
-        
-        for entry in changelog_entries:
-            mod_type = entry["mod_type"]
-            mod_type_counts[mod_type] = mod_type_counts.get(mod_type, 0) + 1
-            current_count = mod_type_counts[mod_type]
-            
-            f.write("==============================\n")
-            f.write(f"{current_count}. Mod Type: {mod_type}\n")
-            f.write(f"TXT USED: {entry['source_file']}\n")
-            f.write(f"File: {entry['file_name']}\n")
-            f.write(f"Source Item: {entry['source_item']}\n")
-            f.write(f"Target Item: {entry['target_item']}\n")
-            f.write(f"Replaced hex: {entry['source_hex']} with {entry['target_hex']}\n")
-            if entry.get('index_occurrences', 0) > 0:
-                f.write(f"Index replaced: {entry['source_index']} with {entry['target_index']} ({entry['index_occurrences']} occurrence(s))\n")
-            elif entry.get('index_failure_reason'):
-                f.write(f"Index replacement failed: {entry['index_failure_reason']}\n")
-            f.write("==============================\n\n")
+    rows = load_journal()
+    for entry in changelog_entries:
+        mod_type = entry["mod_type"]
+        mod_type_counts[mod_type] = mod_type_counts.get(mod_type, 0) + 1
+        rows.append(dict(entry, number=mod_type_counts[mod_type]))
+
+    with open(CHANGELOG_PATH, "w", encoding="utf-8") as f:
+        f.write(CHANGELOG_HEADER)
+        for row in rows:
+            f.write(row["text"] + "\n\n" if "text" in row else render_changelog_entry(row))
+    with open(JOURNAL_PATH, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        f.write(json.dumps({"changelog_sha256": changelog_digest()}) + "\n")
 
 # =========================== MOD SELECTION ===========================
 def select_txt_file():
@@ -70,35 +130,56 @@ def select_txt_file():
 
 def fetch_mod_data(file_path):
     """
-    Reads the mod file and returns a dictionary of mod data.
+    Reads the mod file and returns the catalog of mod data, indexed once.
     Each line should be in the format: SkinID | ModHex | SkinName.
-    Data is stored as key=ModHex and value={'description': SkinID, 'skin_name': SkinName}.
+    Returns {'records': [...], 'by_id': {SkinID: record}, 'by_hex': {ModHex: [records]}},
+    each record being {'description': SkinID, 'hex': ModHex, 'skin_name': SkinName}.
+    Records sharing a hex are all kept; for a repeated SkinID the last line wins.
     """
-    mod_data = {}
+    records = []
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             for line in file:
                 parts = line.strip().split(" | ")
-                if len(parts) >= 3:
-                    skin_id = parts[0].strip()
-                    mod_hex = parts[1].strip()
-                    skin_name = parts[2].strip()
-                    mod_data[mod_hex] = {
-                        'description': skin_id,
-                        'skin_name': skin_name
-                    }
-                elif len(parts) >= 2:
-                    skin_id = parts[0].strip()
-                    mod_hex = parts[1].strip()
-                    mod_data[mod_hex] = {
-                        'description': skin_id,
-                        'skin_name': ""
-                    }
+                if len(parts) >= 2:
+                    records.append({
+                        'description': parts[0].strip(),
+                        'hex': parts[1].strip(),
+                        'skin_name': parts[2].strip() if len(parts) >= 3 else ""
+                    })
     except FileNotFoundError:
         print(f"{Fore.RED}🚨 Error: File not found at path: {file_path}")
     except UnicodeDecodeError:
         print(f"{Fore.RED}🚨 Error: Unable to decode the file at path: {file_path}")
-    return mod_data
+    by_id = {}
+    by_hex = {}
+    for record in records:
+        by_id[record['description']] = record
+        by_hex.setdefault(record['hex'], []).append(record)
+    return {'records': records, 'by_id': by_id, 'by_hex': by_hex}
+
+def resolve_bulk_pairs(lines, mod_data):
+    """
+    Resolve pasted 'sourceID,targetID' lines through the ID index in one pass.
+    Returns (pairs, failures): pairs is a list of (source record, target record),
+    failures a list of (line number, line, reason) for every line that did not resolve.
+    """
+    by_id = mod_data['by_id']
+    pairs = []
+    failures = []
+    for line_no, line in enumerate(lines, 1):
+        if not line:
+            continue
+        if ',' not in line:
+            failures.append((line_no, line, "Format error. Use: sourceID,targetID"))
+            continue
+        src_id, tgt_id = [s.strip() for s in line.split(',', 1)]
+        missing = [skin_id for skin_id in (src_id, tgt_id) if skin_id not in by_id]
+        if missing:
+            failures.append((line_no, line, f"Skin ID not found in the TXT data: {', '.join(missing)}"))
+            continue
+        pairs.append((by_id[src_id], by_id[tgt_id]))
+    return pairs, failures
 
 def fetch_index_hex_from_file(file_path):
     """
@@ -121,98 +202,225 @@ def fetch_index_hex_from_file(file_path):
         print(f"{Fore.RED}🚨 Index file not found!")
     return index_data
 
+# =========================== OCCURRENCE INDEX ===========================
+# Bytes within which the source index hex is looked for, before the mod hex
+INDEX_WINDOW = 30
+
+def hex_to_bytes(hex_value):
+    """bytes for a hex string from a TXT file, or None if it is not valid hex."""
+    try:
+        return bytes.fromhex(hex_value)
+    except (ValueError, TypeError):
+        return None
+
+def first_two_occurrences(data, pattern):
+    """[first, second] non-overlapping positions of pattern in data (-1 when absent)."""
+    first = data.find(pattern)
+    if first == -1:
+        return [-1, -1]
+    return [first, data.find(pattern, first + len(pattern))]
+
+def build_occurrence_index(data, patterns):
+    """Locate the first two occurrences of every pattern once per file."""
+    return {pattern: first_two_occurrences(data, pattern) for pattern in patterns}
+
+def replace_at(data, occurrences, start, old_len, new_bytes):
+    """
+    Replace data[start:start+old_len] with new_bytes and keep the occurrence
+    index in step: positions after the edit are shifted, and only the patterns
+    the edit may have destroyed or created are looked up again.
+    """
+    end = start + old_len
+    delta = len(new_bytes) - old_len
+    data[start:end] = new_bytes
+    for pattern, positions in occurrences.items():
+        reach = len(pattern) - 1
+        touched = any(pos != -1 and start - reach <= pos < end for pos in positions)
+        created = data.find(pattern, max(0, start - reach), start + len(new_bytes) + reach) != -1
+        if touched or created:
+            occurrences[pattern] = first_two_occurrences(data, pattern)
+        elif delta:
+            occurrences[pattern] = [pos + delta if pos >= end else pos for pos in positions]
+
 # =========================== PROCESS MODS ===========================
-def process_mods(directory_path, hex_pairs, output_path, item_replacements, index_hex_data, mod_type, txt_file):
+def patch_mod_file(file_name, read_path, context):
+    """
+    Apply every pair of the context to one file and write it to the output folder.
+    The file is read once and the occurrences of every source mod hex are indexed
+    up front; all pairs are then applied from those offsets to one in-memory copy,
+    which is written once, to the output file + ".part"; process_mods moves it
+    over the output file once the result is back (commit_mod_file).
+    Returns (file_name, changelog entries, modified, error).
+    """
+    hex_pairs = context['hex_pairs']
+    pair_bytes = context['pair_bytes']
+    item_replacements = context['item_replacements']
+    index_hex_data = context['index_hex_data']
+    entries = []
+    try:
+        with open(read_path, 'rb') as f:
+            data = bytearray(f.read())
+        occurrences = build_occurrence_index(data, context['source_patterns'])
+        file_modified = False
+
+        for idx, (mod_source_hex, mod_target_hex) in enumerate(hex_pairs):
+            item1, item2 = item_replacements[idx]
+            source_bytes, target_bytes = pair_bytes[idx]
+            if not source_bytes or not target_bytes:
+                continue
+            first_index, second_index = occurrences[source_bytes]
+            if second_index == -1:
+                continue
+            replace_at(data, occurrences, second_index, len(source_bytes), target_bytes)
+            file_modified = True
+
+            # Index replacement with fallback to alternate candidates
+            idx_occ = 0
+            index_failure_reason = ""
+            if item1 not in index_hex_data and item2 not in index_hex_data:
+                index_failure_reason = "Source and target outfit names not found in index file."
+            elif item1 not in index_hex_data:
+                index_failure_reason = "Source outfit name not found in index file."
+            elif item2 not in index_hex_data:
+                index_failure_reason = "Target outfit name not found in index file."
+            elif hex_to_bytes(index_hex_data[item2][0]) is None:
+                index_failure_reason = f"Target index hex {index_hex_data[item2][0]} is not valid hex."
+            else:
+                # For source, try all candidates; for target, take the first candidate
+                target_index_hex = index_hex_data[item2][0]
+                target_index_bytes = hex_to_bytes(target_index_hex)
+                window_start = max(0, first_index - INDEX_WINDOW)
+                window = bytes(data[window_start:first_index])  # window before the first occurrence
+                for candidate in index_hex_data[item1]:
+                    candidate_bytes = hex_to_bytes(candidate)
+                    pos = window.find(candidate_bytes) if candidate_bytes else -1
+                    if pos != -1:
+                        source_index_hex = candidate
+                        replace_at(data, occurrences, window_start + pos, len(candidate_bytes), target_index_bytes)
+                        idx_occ = 1
+                        break
+                else:
+                    index_failure_reason = "Source index hex not found in expected window for any candidate."
+
+            entries.append({
+                'mod_type': context['mod_type'],
+                'source_file': os.path.basename(context['txt_file']),
+                'file_name': file_name,
+                'source_item': f"{item1} ({mod_source_hex})",
+                'target_item': f"{item2} ({mod_target_hex})",
+                'source_name': item1,
+                'target_name': item2,
+                'source_hex': mod_source_hex,
+                'target_hex': mod_target_hex,
+                'source_index': source_index_hex if idx_occ else 'N/A',
+                'target_index': target_index_hex if idx_occ else 'N/A',
+                'occurrences': 1,
+                'index_occurrences': idx_occ,
+                'index_failure_reason': index_failure_reason
+            })
+
+        if file_modified:
+            with open(os.path.join(context['output_path'], file_name) + ".part", 'wb') as f:
+                f.write(data)
+        return file_name, entries, file_modified, None
+    except Exception as e:
+        return file_name, [], False, str(e)
+
+# Context of the pool's worker processes, set once per process by init_mod_worker
+_worker_context = {}
+
+def init_mod_worker(context):
+    _worker_context.update(context)
+
+def patch_mod_task(task):
+    file_name, read_path = task
+    return patch_mod_file(file_name, read_path, _worker_context)
+
+def commit_mod_file(output_path, result):
+    """Move a finished file's .part output over the output file (see patch_mod_file)."""
+    file_name, entries, modified, error = result
+    write_path = os.path.join(output_path, file_name)
+    try:
+        if modified and error is None:
+            os.replace(write_path + ".part", write_path)
+        elif os.path.exists(write_path + ".part"):
+            os.remove(write_path + ".part")
+    except OSError as e:
+        return file_name, [], False, str(e)
+    return result
+
+def process_mods(directory_path, hex_pairs, output_path, item_replacements, index_hex_data, mod_type, txt_file, workers=WORKERS):
     """
     For each file in directory_path:
       - Uses an existing modified file (in output_path) as the starting point if available.
       - Finds the first and second occurrences of the source mod hex.
       - Replaces ONLY the SECOND occurrence with the target mod hex.
       - Then, for the index replacement, it looks for the source index hex only in a window
-        that starts 30 bytes (60 hex characters) before the FIRST occurrence of the source mod hex.
+        that starts 30 bytes before the FIRST occurrence of the source mod hex.
         Within that window, it replaces only the FIRST occurrence of the source index hex with the target index hex.
       - If the source index hex is not found in the window, it will try all candidates for that outfit.
       - Logs the changes, including a failure reason if the index replacement did not occur.
+    Files are independent, so with workers > 1 they are patched in a process pool.
+    Their changelog entries are merged in file name order either way, before
+    write_changelog numbers them.
     """
-    modified_files = 0
-    for file_name in os.listdir(directory_path):
+    pair_bytes = [(hex_to_bytes(source), hex_to_bytes(target)) for source, target in hex_pairs]
+    for (source, target), (source_bytes, target_bytes), (item1, item2) in zip(hex_pairs, pair_bytes, item_replacements):
+        bad = [f"{side} mod hex {value!r} is not valid hex" for side, value, value_bytes in
+               (("source", source, source_bytes), ("target", target, target_bytes)) if not value_bytes]
+        if bad:
+            print(f"{Fore.YELLOW}⚠️ Skipping {item1} -> {item2}: {'; '.join(bad)}.")
+    names = {name for pair in item_replacements for name in pair}
+    context = {
+        'hex_pairs': hex_pairs,
+        'pair_bytes': pair_bytes,
+        'source_patterns': {source for source, target in pair_bytes if source and target},
+        'item_replacements': item_replacements,
+        # Only the outfits of these pairs, to keep what is sent to workers small
+        'index_hex_data': {name: index_hex_data[name] for name in names if name in index_hex_data},
+        'mod_type': mod_type,
+        'txt_file': txt_file,
+        'output_path': output_path,
+    }
+    tasks = []
+    for file_name in sorted(os.listdir(directory_path)):
         original_file_path = os.path.join(directory_path, file_name)
         if os.path.isfile(original_file_path):
             modded_file_path = os.path.join(output_path, file_name)
             read_path = modded_file_path if os.path.exists(modded_file_path) else original_file_path
+            tasks.append((file_name, read_path))
+    os.makedirs(output_path, exist_ok=True)
 
-            with open(read_path, 'rb') as f:
-                content_bytes = f.read()
-            hex_data = content_bytes.hex()
-            file_modified = False
-
-            for idx, (mod_source_hex, mod_target_hex) in enumerate(hex_pairs):
-                item1, item2 = item_replacements[idx]
-                occ = hex_data.count(mod_source_hex)
-                mod_replaced = 0
-                if occ >= 2:
-                    first_index = hex_data.find(mod_source_hex)
-                    second_index = hex_data.find(mod_source_hex, first_index + len(mod_source_hex))
-                    if second_index != -1:
-                        hex_data = hex_data[:second_index] + mod_target_hex + hex_data[second_index+len(mod_source_hex):]
-                        mod_replaced = 1
-                        file_modified = True
-
-                    # Index replacement with fallback to alternate candidates
-                    index_failure_reason = ""
-                    if mod_replaced:
-                        if not (item1 in index_hex_data and item2 in index_hex_data):
-                            idx_occ = 0
-                            index_failure_reason = "One or both index outfit names not found in index file."
-                        else:
-                            # For source, try all candidates
-                            source_index_candidates = index_hex_data[item1]
-                            # For target, take the first candidate (or you could also add a fallback here)
-                            target_index_candidates = index_hex_data[item2]
-                            target_index_hex = target_index_candidates[0]
-                            window_start = max(0, first_index - 60)
-                            window_end = first_index  # window before the first occurrence
-                            window = hex_data[window_start:window_end]
-                            found = False
-                            for candidate in source_index_candidates:
-                                if candidate in window:
-                                    source_index_hex = candidate
-                                    found = True
-                                    break
-                            if found:
-                                new_window = window.replace(source_index_hex, target_index_hex, 1)
-                                hex_data = hex_data[:window_start] + new_window + hex_data[window_end:]
-                                idx_occ = 1
-                            else:
-                                idx_occ = 0
-                                index_failure_reason = "Source index hex not found in expected window for any candidate."
-                    else:
-                        idx_occ = 0
-                        index_failure_reason = ""
-
-                    if mod_replaced:
-                        changelog_entries.append({
-                            'mod_type': mod_type,
-                            'source_file': os.path.basename(txt_file),
-                            'file_name': file_name,
-                            'source_item': f"{item1} ({mod_source_hex})",
-                            'target_item': f"{item2} ({mod_target_hex})",
-                            'source_hex': mod_source_hex,
-                            'target_hex': mod_target_hex,
-                            'source_index': source_index_hex if mod_replaced and idx_occ else 'N/A',
-                            'target_index': target_index_hex if mod_replaced and idx_occ else 'N/A',
-                            'occurrences': mod_replaced,
-                            'index_occurrences': idx_occ,
-                            'index_failure_reason': index_failure_reason
-                        })
-
-            if file_modified:
-                updated_data = bytes.fromhex(hex_data)
-                os.makedirs(output_path, exist_ok=True)
-                output_file_path = os.path.join(output_path, file_name)
-                with open(output_file_path, 'wb') as f:
-                    f.write(updated_data)
-                modified_files += 1
+    # Files whose worker never returned (pool unavailable, or broken by a killed
+    # worker) are patched here. Their output file was not replaced yet, so the
+    # retry reads the same bytes instead of patching a patched file again.
+    results = [None] * len(tasks)
+    if workers and workers > 1 and len(tasks) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_mod_worker, initargs=(context,)) as executor:
+                futures = [executor.submit(patch_mod_task, task) for task in tasks]
+                for i, future in enumerate(futures):
+                    try:
+                        results[i] = commit_mod_file(output_path, future.result())
+                    except BrokenProcessPool:
+                        pass
+        except (ImportError, NotImplementedError, OSError, BrokenProcessPool) as e:
+            print(f"{Fore.YELLOW}⚠️ Process pool unavailable ({e}). Patching files one at a time.")
+        else:
+            remaining = results.count(None)
+            if remaining:
+                print(f"{Fore.YELLOW}⚠️ Process pool stopped early. Patching the {remaining} remaining file(s) one at a time.")
+    for i, (file_name, read_path) in enumerate(tasks):
+        if results[i] is None:
+            results[i] = commit_mod_file(output_path, patch_mod_file(file_name, read_path, context))
+
+    modified_files = 0
+    for file_name, entries, modified, error in results:
+        if error:
+            print(f"{Fore.RED}🚨 Error patching {file_name}: {error}")
+            continue
+        changelog_entries.extend(entries)
+        modified_files += modified
     return modified_files
 
 # =========================== HELPER: SINGLE PAIR SELECTION ===========================
@@ -220,26 +428,39 @@ def select_mod_option(mod_data):
     """Search and select an item from mod data by matching description (SkinID) or skin name.
        Returns (mod_hex, skin_name)."""
     search_term = input(f"\n{Fore.CYAN}🔍 Search item: ").lower()
-    results = {}
-    for hex_val, details in mod_data.items():
-        if search_term in details['description'].lower() or search_term in details['skin_name'].lower():
-            results[hex_val] = details
+    results = [record for record in mod_data['records']
+               if search_term in record['description'].lower() or search_term in record['skin_name'].lower()]
     if not results:
         print(f"{Fore.RED}🔍 No matches found!")
         return None, None
     print(f"\n{Fore.GREEN}📋 Results:")
-    for idx, (hex_val, details) in enumerate(results.items(), 1):
-        print(f"{Fore.CYAN}{idx}. {details['description']} - {details['skin_name']} ({hex_val})")
+    for idx, record in enumerate(results, 1):
+        print(f"{Fore.CYAN}{idx}. {record['description']} - {record['skin_name']} ({record['hex']})")
     while True:
         try:
             choice = int(input(f"\n{Fore.CYAN}🔢 Select item (1-{len(results)}): "))
             if 1 <= choice <= len(results):
-                chosen_hex = list(results.keys())[choice-1]
-                return chosen_hex, results[chosen_hex]['skin_name']
+                chosen = results[choice-1]
+                return chosen['hex'], chosen['skin_name']
             print(f"{Fore.RED}❌ Invalid selection!")
         except ValueError:
             print(f"{Fore.RED}❌ Please enter a number!")
 
+# =========================== HELPER: WORKER PROCESSES ===========================
+def ask_workers():
+    """Ask how many processes patch the ICON_MOD files; Enter keeps WORKERS."""
+    while True:
+        answer = input(f"\n{Fore.CYAN}⚙️ Processes for patching files (Enter = {max(WORKERS, 1)}): ").strip()
+        if not answer:
+            return WORKERS
+        try:
+            workers = int(answer)
+            if workers >= 0:
+                return workers
+            print(f"{Fore.RED}❌ Please enter 0 or more!")
+        except ValueError:
+            print(f"{Fore.RED}❌ Please enter a number!")
+
 # =========================== MAIN FLOW ===========================
 def mod_tool():
     print(f"\n{Fore.CYAN}🌟 Welcome to PUBG Mod Tool v2.0 🌟{Style.RESET_ALL}")
@@ -250,7 +471,7 @@ def mod_tool():
 
     print(f"\n{Fore.YELLOW}⚙️ Loading {mod_type} data...")
     mod_data = fetch_mod_data(txt_file)
-    if not mod_data:
+    if not mod_data['records']:
         print(f"{Fore.RED}🚨 Failed to load mod data")
         return
 
@@ -288,30 +509,15 @@ def mod_tool():
                     if line.lower() == 'q':
                         break
                     lines.append(line)
-                for line in lines:
-                    if not line:
-                        continue
-                    if ',' not in line:
-                        print(f"{Fore.RED}❌ Format error. Use: sourceID,targetID")
-                        continue
-                    src_id, tgt_id = [s.strip() for s in line.split(',', 1)]
-                    src_hex = None
-                    tgt_hex = None
-                    src_name = None
-                    tgt_name = None
-                    for mod_hex, data in mod_data.items():
-                        if data["description"] == src_id:
-                            src_hex = mod_hex
-                            src_name = data["skin_name"]
-                        if data["description"] == tgt_id:
-                            tgt_hex = mod_hex
-                            tgt_name = data["skin_name"]
-                    if not src_hex or not tgt_hex:
-                        print(f"{Fore.RED}❌ One or both skin IDs not found in the TXT data.")
-                    else:
-                        hex_pairs.append((src_hex, tgt_hex))
-                        item_replacements.append((src_name, tgt_name))
-                        print(f"{Fore.GREEN}✅ Added bulk replacement: {src_id} → {tgt_id}")
+                pairs, failures = resolve_bulk_pairs(lines, mod_data)
+                for src, tgt in pairs:
+                    hex_pairs.append((src['hex'], tgt['hex']))
+                    item_replacements.append((src['skin_name'], tgt['skin_name']))
+                print(f"{Fore.GREEN}✅ Added {len(pairs)} bulk replacement(s).")
+                if failures:
+                    print(f"{Fore.RED}❌ {len(failures)} line(s) could not be added:")
+                    for line_no, line, reason in failures:
+                        print(f"{Fore.RED}   {line_no}. {line} - {reason}")
             elif choice == 'q':
                 if not hex_pairs:
                     print(f"{Fore.RED}🚨 No replacements added!")
@@ -346,8 +552,9 @@ def mod_tool():
                 print(f"{Fore.RED}❌ Invalid choice!")
     
     if hex_pairs:
+        workers = ask_workers()
         total_modified = process_mods(ICON_MOD_DIR, hex_pairs, REPACK_OBB_DIR, 
-                                      item_replacements, index_data, mod_type, txt_file)
+                                      item_replacements, index_data, mod_type, txt_file, workers)
         write_changelog()
         print(f"\n{Fore.GREEN}🎉 Successfully modified {total_modified} files!")
         print(f"{Fore.CYAN}📝 Changelog updated at: {CHANGELOG_PATH}")
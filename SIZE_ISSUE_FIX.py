@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 import os
 import re
+import json
+import hashlib
+from collections import deque
 
 # ANSI color codes for decoration
 GREEN  = "\033[92m"
@@ -58,21 +61,73 @@ def parse_guns(guns_file):
             guns_list.append(entry)
     return guns_list
 
+def read_journal(journal_file, changelog_file):
+    """
+    Rows of changelog.jsonl, or None when the journal cannot stand in for
+    changelog.txt: missing, unreadable, or stamped ({"changelog_sha256"}) with
+    a changelog.txt other than the current one (edited or deleted since).
+    """
+    if not os.path.exists(journal_file):
+        return None
+    rows = []
+    stamps = []
+    with open(journal_file, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                print(f"{YELLOW}{INFO} Skipping unreadable changelog.jsonl line {line_no}.{RESET}")
+                continue
+            if "changelog_sha256" in row:
+                stamps.append(row["changelog_sha256"])
+            else:
+                rows.append(row)
+    try:
+        with open(changelog_file, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        digest = None
+    if not stamps or stamps[-1] != digest:
+        print(f"{YELLOW}{INFO} changelog.jsonl does not match changelog.txt; reading changelog.txt instead.{RESET}")
+        return None
+    return rows
+
 def parse_changelog(changelog_file):
     """
-    Reads changelog.txt and returns a set of normalized gun names 
-    from lines starting with "Source Gun:" or "Target Gun:".
+    Returns a set of normalized gun names used in the changelog.
+    Reads the changelog.jsonl journal next to changelog.txt when it is in step
+    with it (its "source_gun"/"target_gun" fields); otherwise scans changelog.txt
+    for lines starting with "Source Gun:" or "Target Gun:".
     """
     excluded = set()
+    journal_file = os.path.join(os.path.dirname(changelog_file), "changelog.jsonl")
+    rows = read_journal(journal_file, changelog_file)
+    if rows is not None:
+        for row in rows:
+            if "text" in row:
+                # Legacy block carried over verbatim from an old changelog.txt
+                excluded.update(parse_changelog_lines(row["text"].splitlines()))
+                continue
+            excluded.add(normalize_gun_name(row["source_gun"]))
+            excluded.add(normalize_gun_name(row["target_gun"]))
+        return excluded
     with open(changelog_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("Source Gun:"):
-                gun = line[len("Source Gun:"):].strip()
-                excluded.add(normalize_gun_name(gun))
-            elif line.startswith("Target Gun:"):
-                gun = line[len("Target Gun:"):].strip()
-                excluded.add(normalize_gun_name(gun))
+        excluded.update(parse_changelog_lines(f))
+    return excluded
+
+def parse_changelog_lines(lines):
+    """Normalized gun names from "Source Gun:" / "Target Gun:" changelog lines."""
+    excluded = set()
+    for line in lines:
+        line = line.strip()
+        if line.startswith("Source Gun:"):
+            gun = line[len("Source Gun:"):].strip()
+            excluded.add(normalize_gun_name(gun))
+        elif line.startswith("Target Gun:"):
+            gun = line[len("Target Gun:"):].strip()
+            excluded.add(normalize_gun_name(gun))
     return excluded
 
 def parse_longhex(longhex_file):
@@ -92,6 +147,120 @@ def parse_longhex(longhex_file):
             lh[parts[0]] = parts[1]
     return lh
 
+def build_automaton(patterns):
+    """
+    Build an Aho-Corasick automaton for a list of byte patterns.
+
+    The failure links are folded into a full transition table (one 256-entry
+    row per state), so scanning is a single table lookup per byte.
+    Returns (delta, outputs): outputs[state] lists the pattern ids ending there.
+    """
+    goto = [{}]
+    outputs = [[]]
+    for pattern_id, pattern in enumerate(patterns):
+        state = 0
+        for byte in pattern:
+            nxt = goto[state].get(byte)
+            if nxt is None:
+                goto.append({})
+                outputs.append([])
+                nxt = len(goto) - 1
+                goto[state][byte] = nxt
+            state = nxt
+        outputs[state].append(pattern_id)
+
+    fail = [0] * len(goto)
+    delta = [None] * len(goto)
+    root_row = [0] * 256
+    for byte, nxt in goto[0].items():
+        root_row[byte] = nxt
+    delta[0] = root_row
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        row = list(delta[fail[state]])
+        for byte, nxt in goto[state].items():
+            fail[nxt] = delta[fail[state]][byte]
+            outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+            row[byte] = nxt
+            queue.append(nxt)
+        delta[state] = row
+    return delta, outputs
+
+def scan_automaton(automaton, patterns, data):
+    """
+    Scan data once and return {pattern_id: [start offsets]} for every
+    (possibly overlapping) match of every pattern.
+    """
+    delta, outputs = automaton
+    matches = {}
+    state = 0
+    for i, byte in enumerate(data):
+        state = delta[state][byte]
+        if outputs[state]:
+            for pattern_id in outputs[state]:
+                matches.setdefault(pattern_id, []).append(i - len(patterns[pattern_id]) + 1)
+    return matches
+
+def build_null_plan(entries):
+    """
+    Turn (label, hex string) entries into a null plan reused for every file:
+    (entries as (label, hex, pattern_id), patterns, automaton).
+    Invalid hex values are reported once and dropped.
+    """
+    patterns = []
+    pattern_ids = {}
+    plan_entries = []
+    for label, hex_val in entries:
+        try:
+            hex_bytes = bytes.fromhex(hex_val)
+        except ValueError:
+            print(f"{RED}{CROSS} Invalid hex '{hex_val}' for gun '{label}'{RESET}")
+            continue
+        if not hex_bytes:
+            continue
+        if hex_bytes not in pattern_ids:
+            pattern_ids[hex_bytes] = len(patterns)
+            patterns.append(hex_bytes)
+        plan_entries.append((label, hex_val, pattern_ids[hex_bytes]))
+    return plan_entries, patterns, build_automaton(patterns)
+
+def apply_null_plan(data, plan):
+    """
+    Null every planned hex in one pass over data.
+
+    Entries are applied in catalog order with the same outcome as calling
+    data.replace(hex, nulls) per gun: an occurrence only counts if it is still
+    intact after earlier guns were nulled. Matches come from the original data,
+    so a hex that would only appear once its neighbours are nulled is ignored.
+    Returns (new_data, [(label, hex)] hit).
+    """
+    plan_entries, patterns, automaton = plan
+    if not plan_entries:
+        return data, []
+    matches = scan_automaton(automaton, patterns, data)
+    if not matches:
+        return data, []
+    out = bytearray(data)
+    hits = []
+    for label, hex_val, pattern_id in plan_entries:
+        positions = matches.get(pattern_id)
+        if not positions:
+            continue
+        pattern = patterns[pattern_id]
+        size = len(pattern)
+        last_end = 0
+        replaced = False
+        for pos in positions:
+            if pos < last_end or out[pos:pos + size] != pattern:
+                continue
+            out[pos:pos + size] = bytes(size)
+            last_end = pos + size
+            replaced = True
+        if replaced:
+            hits.append((label, hex_val))
+    return bytes(out), hits
+
 def process_files(files_dir, guns_list, combined_excluded, longhex_dict):
     """
     Process files in files_dir according to three branches:
@@ -107,9 +276,24 @@ def process_files(files_dir, guns_list, combined_excluded, longhex_dict):
           → Null normal hex (from guns.txt) for all guns.
       
     In all branches, skip guns whose normalized name is in combined_excluded.
+    Each branch's hex set is compiled once into an Aho-Corasick automaton, so
+    every file is scanned a single time regardless of the catalog size.
     A log is generated and saved as log.txt in files_dir.
     """
     exception_files = {"00065947", "00065948", "00065949"}
+
+    longhex_plan = build_null_plan([
+        (lh_gun, lh_val) for lh_gun, lh_val in longhex_dict.items()
+        if "(lv" in lh_gun.lower() and normalize_gun_name(lh_gun) not in combined_excluded
+    ])
+    leveled_plan = build_null_plan([
+        (gun['gun_name'], gun['hex']) for gun in guns_list
+        if "(lv" in gun['gun_name'].lower() and gun['normalized'] not in combined_excluded
+    ])
+    all_plan = build_null_plan([
+        (gun['gun_name'], gun['hex']) for gun in guns_list
+        if gun['normalized'] not in combined_excluded
+    ])
     
     total_normal_replacements = 0
     total_longhex_replacements = 0
@@ -130,65 +314,30 @@ def process_files(files_dir, guns_list, combined_excluded, longhex_dict):
                 print(f"{RED}{CROSS} Error reading {file_path}: {e}{RESET}")
                 continue
             
-            modified = False
             file_log = []  # Log for this file
             
             # Branch 1: Files exactly "00065947", "00065948", "00065949" → process longhex for leveled guns.
             if file_base in exception_files:
-                for lh_gun, lh_val in longhex_dict.items():
-                    if "(lv" not in lh_gun.lower():
-                        continue
-                    if normalize_gun_name(lh_gun) in combined_excluded:
-                        continue
-                    try:
-                        lh_bytes = bytes.fromhex(lh_val)
-                    except ValueError:
-                        print(f"{RED}{CROSS} Invalid longhex '{lh_val}' for gun '{lh_gun}' in {file_path}{RESET}")
-                        continue
-                    null_bytes = b'\x00' * len(lh_bytes)
-                    if lh_bytes in data:
-                        data = data.replace(lh_bytes, null_bytes)
-                        modified = True
-                        total_longhex_replacements += 1
-                        file_log.append(f"   - {lh_gun}: replaced longhex {lh_val}")
+                data, hits = apply_null_plan(data, longhex_plan)
+                total_longhex_replacements += len(hits)
+                for lh_gun, lh_val in hits:
+                    file_log.append(f"   - {lh_gun}: replaced longhex {lh_val}")
             
             # Branch 2: Files with "00061" in the name → process normal hex for leveled guns only.
             elif "00061" in file_base:
-                for gun in guns_list:
-                    if "(lv" not in gun['gun_name'].lower():
-                        continue
-                    if gun['normalized'] in combined_excluded:
-                        continue
-                    try:
-                        hex_bytes = bytes.fromhex(gun['hex'])
-                    except ValueError:
-                        print(f"{RED}{CROSS} Invalid hex '{gun['hex']}' for gun '{gun['gun_name']}' in {file_path}{RESET}")
-                        continue
-                    null_bytes = b'\x00' * len(hex_bytes)
-                    if hex_bytes in data:
-                        data = data.replace(hex_bytes, null_bytes)
-                        modified = True
-                        total_normal_replacements += 1
-                        file_log.append(f"   - {gun['gun_name']}: replaced normal hex {gun['hex']}")
+                data, hits = apply_null_plan(data, leveled_plan)
+                total_normal_replacements += len(hits)
+                for gun_name, hex_val in hits:
+                    file_log.append(f"   - {gun_name}: replaced normal hex {hex_val}")
             
             # Branch 3: All other files → process normal hex for all guns.
             else:
-                for gun in guns_list:
-                    if gun['normalized'] in combined_excluded:
-                        continue
-                    try:
-                        hex_bytes = bytes.fromhex(gun['hex'])
-                    except ValueError:
-                        print(f"{RED}{CROSS} Invalid hex '{gun['hex']}' for gun '{gun['gun_name']}' in {file_path}{RESET}")
-                        continue
-                    null_bytes = b'\x00' * len(hex_bytes)
-                    if hex_bytes in data:
-                        data = data.replace(hex_bytes, null_bytes)
-                        modified = True
-                        total_normal_replacements += 1
-                        file_log.append(f"   - {gun['gun_name']}: replaced normal hex {gun['hex']}")
+                data, hits = apply_null_plan(data, all_plan)
+                total_normal_replacements += len(hits)
+                for gun_name, hex_val in hits:
+                    file_log.append(f"   - {gun_name}: replaced normal hex {hex_val}")
             
-            if modified:
+            if hits:
                 try:
                     with open(file_path, 'wb') as f:
                         f.write(data)
@@ -1,5 +1,7 @@
 import os
 import re
+import json
+import hashlib
 import colorama
 from colorama import Fore, Style
 
@@ -53,6 +55,74 @@ def parse_changelog_block(block):
         "name_exclusions": name_exclusions
     }
 
+# ---------------------------
+# Helper: Same exclusions as parse_changelog_block, from a changelog.jsonl row.
+# ---------------------------
+def parse_changelog_row(row):
+    if "text" in row:
+        # Block carried over verbatim from a changelog.txt older than the journal
+        return parse_changelog_block(row["text"])
+    if not all(key in row for key in ("file_name", "source_hex", "target_hex", "source_name", "target_name")):
+        return None
+    source_name = row["source_name"]
+    target_name = row["target_name"]
+    index_exclusions = set()
+    if row.get("index_occurrences", 0) > 0:
+        index_exclusions.update({row["source_index"].strip().lower(), row["target_index"].strip().lower()})
+    return {
+        "repack_filename": row["file_name"].strip(),
+        "hex_exclusions": {row["source_hex"].strip().lower(), row["target_hex"].strip().lower()},
+        "index_exclusions": index_exclusions,
+        "name_exclusions": {source_name.strip().lower(), target_name.strip().lower()}
+    }
+
+# ---------------------------
+# Helper: Rows of changelog.jsonl, or None when it is missing or its last
+# {"changelog_sha256"} stamp is not the current changelog.txt (edited or deleted since).
+# ---------------------------
+def read_journal(journal_path, changelog_path):
+    if not os.path.exists(journal_path):
+        return None
+    rows = []
+    stamps = []
+    with open(journal_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                print(f"{Fore.YELLOW}⚠️ Skipping unreadable changelog.jsonl line {line_no}.")
+                continue
+            if "changelog_sha256" in row:
+                stamps.append(row["changelog_sha256"])
+            else:
+                rows.append(row)
+    try:
+        with open(changelog_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        digest = None
+    if not stamps or stamps[-1] != digest:
+        print(f"{Fore.YELLOW}⚠️ changelog.jsonl does not match changelog.txt; reading changelog.txt instead.")
+        return None
+    return rows
+
+# ---------------------------
+# Helper: Changelog entries as exclusion dicts, from the journal when it is in step with changelog.txt.
+# ---------------------------
+def load_changelog_entries():
+    journal_path = os.path.join(REPACK_DIR, "changelog.jsonl")
+    changelog_path = os.path.join(REPACK_DIR, "changelog.txt")
+    rows = read_journal(journal_path, changelog_path)
+    if rows is not None:
+        return [parse_changelog_row(row) for row in rows]
+    with open(changelog_path, "r", encoding="utf-8") as f:
+        changelog_content = f.read()
+    # Split into blocks.
+    blocks = [block.strip() for block in changelog_content.split("==============================") if block.strip()]
+    return [parse_changelog_block(block) for block in blocks]
+
 # ---------------------------
 # Helper: Load valid hex codes from ALL.txt.
 # ---------------------------
@@ -87,18 +157,9 @@ def process_changelog():
     # Ask for additional exclusions from user.
     extra_exclusions = get_user_exclusions()
     
-    # Read changelog file.
-    changelog_path = os.path.join(REPACK_DIR, "changelog.txt")
-    with open(changelog_path, "r", encoding="utf-8") as f:
-        changelog_content = f.read()
-    
-    # Split into blocks.
-    blocks = [block.strip() for block in changelog_content.split("==============================") if block.strip()]
-    
     # Group modifications by repack file.
     file_groups = {}  # key: repack filename; value: { path, content, hex_exclusions, index_exclusions, name_exclusions }
-    for block in blocks:
-        data = parse_changelog_block(block)
+    for data in load_changelog_entries():
         if not data:
             continue
         repack_filename = data["repack_filename"]
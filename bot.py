@@ -5,6 +5,7 @@ import subprocess
 import time
 from pathlib import Path
 from colorama import init, Fore, Style
+from fastcopy import copy_file, format_copy_rate
 
 # Initialize colorama
 init(autoreset=True)
@@ -124,8 +125,8 @@ def repakgamepach1(selected_file):
     result_pak_file = result_dir / selected_file.name
 
     # Step 1: Copy original .pak to repack folder  
-    shutil.copy2(original_pak_file, copied_pak_file)
-    print(Fore.BLUE + "Copied original file to repack folder.")
+    copy_stats = copy_file(original_pak_file, copied_pak_file, preserve_metadata=True)
+    print(Fore.BLUE + f"Copied original file to repack folder ({format_copy_rate(copy_stats)}).")
 
     # Step 2: Run repacking using the copied file  
     print(Fore.LIGHTGREEN_EX + "Repacking in progress...")
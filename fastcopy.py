@@ -0,0 +1,118 @@
+import os
+import errno
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Shared file copy used by the modding tools (GOATED, MOD_CAR, entry/bot repack).
+# Tries, in order: a reflink (copy-on-write clone, Btrfs/XFS/APFS-style filesystems),
+# os.copy_file_range, os.sendfile, and finally a buffered copy with large chunks.
+# Hardlinks are never used: every caller edits or appends to its copy, which
+# would silently change the original too.
+
+FICLONE = 0x40049409  # Linux ioctl: clone the whole source file into dest
+BUFFER_SIZE = 8 << 20
+
+# errnos meaning "this method does not work for these files", as opposed to real I/O errors
+FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.ENOTTY, errno.EBADF,
+    errno.EPERM, errno.EACCES, getattr(errno, "EOPNOTSUPP", errno.EINVAL),
+    getattr(errno, "ENOTSUP", errno.EINVAL), getattr(errno, "ETXTBSY", errno.EINVAL),
+}
+
+# (method, source device, destination device) combinations that already failed once
+_unsupported = set()
+
+def _reflink(src, dst, size):
+    if fcntl is None:
+        raise OSError(errno.ENOSYS, "reflink not available")
+    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+def _copy_file_range(src, dst, size):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range not available")
+    remaining = size
+    while remaining > 0:
+        copied = os.copy_file_range(src.fileno(), dst.fileno(), min(remaining, 1 << 30))
+        if copied == 0:
+            # Some filesystems (procfs-like, some FUSE mounts) report EOF instead of failing.
+            raise OSError(errno.EINVAL, "copy_file_range copied nothing")
+        remaining -= copied
+
+def _sendfile(src, dst, size):
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile not available")
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst.fileno(), src.fileno(), offset, min(size - offset, 1 << 30))
+        if sent == 0:
+            raise OSError(errno.EINVAL, "sendfile copied nothing")
+        offset += sent
+
+def _buffered(src, dst, size):
+    shutil.copyfileobj(src, dst, BUFFER_SIZE)
+
+COPY_METHODS = [
+    ("reflink", _reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _sendfile),
+    ("buffered", _buffered),
+]
+
+def copy_file(src_path, dst_path, preserve_metadata=False):
+    """
+    Copy src_path to dst_path (overwriting it) with the fastest method the two
+    filesystems support. preserve_metadata also copies mode and timestamps,
+    like shutil.copy2.
+    Returns {"bytes", "seconds", "method"} for rate reporting.
+    """
+    started = time.perf_counter()
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        st = os.fstat(src.fileno())
+        size = st.st_size
+        devices = (st.st_dev, os.fstat(dst.fileno()).st_dev)
+        for name, method in COPY_METHODS:
+            if name != "buffered" and (name, devices) in _unsupported:
+                continue
+            try:
+                method(src, dst, size)
+                dst.flush()
+                copied = os.fstat(dst.fileno()).st_size
+                if copied != size:
+                    # Short copy: treat the method as unsupported and retry with the next one.
+                    raise OSError(errno.EINVAL, f"{name} copied {copied} of {size} bytes")
+                break
+            except OSError as e:
+                if name == "buffered" or e.errno not in FALLBACK_ERRNOS:
+                    raise
+                _unsupported.add((name, devices))
+                # Start the next method from a clean, empty destination.
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+    if preserve_metadata:
+        shutil.copystat(src_path, dst_path)
+    return {"bytes": size, "seconds": time.perf_counter() - started, "method": name}
+
+def merge_copy_stats(stats_list):
+    """Combine several copy_file results into one (method: the ones used, comma separated)."""
+    methods = []
+    for stats in stats_list:
+        if stats["method"] not in methods:
+            methods.append(stats["method"])
+    return {
+        "bytes": sum(stats["bytes"] for stats in stats_list),
+        "seconds": sum(stats["seconds"] for stats in stats_list),
+        "method": ", ".join(methods),
+    }
+
+def format_copy_rate(stats):
+    """'12.3 MB in 0.41s (30.0 MB/s, copy_file_range)'"""
+    megabytes = stats["bytes"] / (1024 * 1024)
+    seconds = stats["seconds"]
+    rate = f"{megabytes / seconds:.1f} MB/s" if seconds > 0 else "instant"
+    return f"{megabytes:.1f} MB in {seconds:.2f}s ({rate}, {stats['method']})"
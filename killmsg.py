@@ -1,11 +1,15 @@
 import os
+import re
+import json
+import hashlib
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt
 from rich.panel import Panel
-from rich.progress import track
+from rich.progress import Progress
 
 # Initialize Rich console
 console = Console()
@@ -20,12 +24,31 @@ PASTEBIN_USER_API_KEY = "a8bddbb5b1755c060c0f63a130bff66e"
 XSUIT_PASTE_ID = "ZAn3bz4p"
 OUTFITS_PASTE_ID = "hn0jReVN"
 
+# Parsed catalogs are cached on disk and only fetched again once older than the TTL
+CATALOG_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "killmsg_catalogs.json")
+CATALOG_TTL = 24 * 60 * 60  # seconds
+
+# Stand-in for Pastebin (offline and test runs): a folder holding <paste id>.txt
+# files, or an http(s) base URL serving the raw pastes at <url>/<paste id>.
+CATALOG_SOURCE = os.environ.get("KILLMSG_CATALOG_SOURCE", "")
+
+# One HTTP session, so the catalog fetches reuse connections
+http = requests.Session()
+
 def clear_screen():
     """Clears the console screen."""
     console.clear()
 
 def get_paste_content(paste_id, dev_key, user_key):
-    """Fetch the raw content of a private Pastebin paste."""
+    """Fetch the raw content of a private Pastebin paste (or of its CATALOG_SOURCE stand-in)."""
+    if CATALOG_SOURCE.startswith(("http://", "https://")):
+        response = http.get(f"{CATALOG_SOURCE.rstrip('/')}/{paste_id}", timeout=15)
+        if response.status_code == 200:
+            return response.text
+        raise Exception(f"Error fetching paste: {response.status_code}")
+    if CATALOG_SOURCE:
+        with open(os.path.join(CATALOG_SOURCE, f"{paste_id}.txt"), "r", encoding="utf-8") as f:
+            return f.read()
     url = "https://pastebin.com/api/api_raw.php"
     data = {
         "api_dev_key": dev_key,
@@ -33,18 +56,17 @@ def get_paste_content(paste_id, dev_key, user_key):
         "api_option": "show_paste",
         "api_paste_key": paste_id
     }
-    response = requests.post(url, data=data)
+    response = http.post(url, data=data, timeout=15)
     if response.status_code == 200:
         return response.text
     else:
         raise Exception(f"Error fetching paste: {response.status_code}")
 
-def load_items_from_pastebin(paste_id, dev_key, user_key):
+def parse_items(content):
     """
-    Load and parse items from the paste content.
+    Parse items from paste content.
     Expected format per line: Name: HexValue
     """
-    content = get_paste_content(paste_id, dev_key, user_key)
     items = {}
     for line in content.splitlines():
         if ':' in line:
@@ -52,6 +74,73 @@ def load_items_from_pastebin(paste_id, dev_key, user_key):
             items[name.strip()] = hex_value.strip()
     return items
 
+def load_items_from_pastebin(paste_id, dev_key, user_key):
+    """Load and parse items from the paste content."""
+    return parse_items(get_paste_content(paste_id, dev_key, user_key))
+
+def catalog_cache_key(paste_id):
+    """
+    Cache key of a paste: the bare paste id for Pastebin, prefixed with the
+    CATALOG_SOURCE stand-in otherwise so its catalogs never replace the real ones.
+    """
+    return f"{CATALOG_SOURCE}|{paste_id}" if CATALOG_SOURCE else paste_id
+
+def read_catalog_cache():
+    """The on-disk catalog cache: {catalog_cache_key: {"fetched_at", "sha256", "items"}}."""
+    try:
+        with open(CATALOG_CACHE_FILE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def write_catalog_cache(cache):
+    temp_path = CATALOG_CACHE_FILE + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(temp_path, CATALOG_CACHE_FILE)
+
+def load_catalogs(paste_ids, force_refresh=False):
+    """
+    Return ({paste_id: items}, warnings) for the given pastes.
+    Catalogs cached within CATALOG_TTL are used as they are; stale ones are
+    fetched concurrently and only re-parsed when their content hash changed.
+    When a fetch fails, the stale cached copy is used instead.
+    """
+    cache = read_catalog_cache()
+    now = time.time()
+    keys = {paste_id: catalog_cache_key(paste_id) for paste_id in paste_ids}
+    stale = [paste_id for paste_id in paste_ids
+             if force_refresh or keys[paste_id] not in cache
+             or now - cache[keys[paste_id]].get("fetched_at", 0) > CATALOG_TTL]
+    warnings = []
+    if stale:
+        def fetch(paste_id):
+            try:
+                return paste_id, get_paste_content(paste_id, PASTEBIN_API_KEY, PASTEBIN_USER_API_KEY), None
+            except Exception as e:
+                return paste_id, None, e
+        with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+            results = list(executor.map(fetch, stale))
+        for paste_id, content, error in results:
+            if error is not None:
+                if keys[paste_id] in cache:
+                    warnings.append(f"Could not refresh {paste_id} ({error}); using the cached copy.")
+                else:
+                    warnings.append(f"Could not fetch {paste_id}: {error}")
+                continue
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            entry = cache.get(keys[paste_id], {})
+            if entry.get("sha256") != digest:
+                entry = {"sha256": digest, "items": parse_items(content)}
+            entry["fetched_at"] = now
+            cache[keys[paste_id]] = entry
+        try:
+            write_catalog_cache(cache)
+        except OSError as e:
+            warnings.append(f"Could not save the catalog cache: {e}")
+    return {paste_id: cache[keys[paste_id]]["items"] for paste_id in paste_ids if keys[paste_id] in cache}, warnings
+
 def choose_multiple_items(items, prompt_text):
     """
     Displays a table of items and lets the user select multiple entries
@@ -113,49 +202,98 @@ def choose_replacement_for_xsuit(x_suit_name, outfits):
         console.print("[red]Invalid input, please enter a number.[/red]")
         return None, None
 
+def find_replacement_conflicts(replacements):
+    """
+    Check a list of (x_suit_name, x_hex, outfit_name, outfit_hex) before touching
+    the file. Returns a list of messages: invalid hex, an X-Suit hex given two
+    different outfits, or one X-Suit hex contained in another (the match would
+    depend on position).
+    """
+    conflicts = []
+    targets = {}
+    for x_name, x_hex, outfit_name, outfit_hex in replacements:
+        try:
+            source, target = bytes.fromhex(x_hex), bytes.fromhex(outfit_hex)
+        except ValueError:
+            conflicts.append(f"{x_name} → {outfit_name}: invalid hex ({x_hex} / {outfit_hex}).")
+            continue
+        if not source:
+            conflicts.append(f"{x_name}: empty X-Suit hex.")
+        elif source in targets and targets[source][1] != target:
+            conflicts.append(f"{x_name} ({x_hex}) is already replaced with {targets[source][0]}.")
+        else:
+            targets.setdefault(source, (outfit_name, target))
+    sources = sorted(targets, key=len)
+    for i, short in enumerate(sources):
+        for long in sources[i + 1:]:
+            if short != long and short in long:
+                conflicts.append(f"X-Suit hex {short.hex()} is part of X-Suit hex {long.hex()}.")
+    return conflicts
+
+def substitute_all(data, mapping, on_progress=None):
+    """
+    Replace every occurrence of each key of mapping (bytes -> bytes) in one left
+    to right pass. Replacements are never rescanned, so an outfit hex equal to
+    another X-Suit hex is not replaced again. on_progress(position) reports how
+    far the scan got. Returns (new data, {source: occurrences}).
+    """
+    pattern = re.compile(b"|".join(re.escape(source) for source in sorted(mapping, key=len, reverse=True)))
+    counts = dict.fromkeys(mapping, 0)
+    pieces = []
+    last = 0
+    for match in pattern.finditer(data):
+        source = match.group()
+        pieces.append(data[last:match.start()])
+        pieces.append(mapping[source])
+        counts[source] += 1
+        last = match.end()
+        if on_progress:
+            on_progress(last)
+    pieces.append(data[last:])
+    if on_progress:
+        on_progress(len(data))
+    return b"".join(pieces), counts
+
 def perform_replacements(replacements):
     """
-    Reads the original binary file and applies multiple hex replacements.
+    Reads the original binary file and applies multiple hex replacements simultaneously.
     'replacements' is a list of tuples: (x_suit_name, x_hex, outfit_name, outfit_hex).
-    A progress animation is displayed during processing.
+    Progress follows the single scan through the file.
+    Returns (modified_file, {x_hex: occurrences replaced}).
     """
-    with console.status("Processing hex replacements...", spinner="dots"):
-        try:
-            with open(ORIGINAL_BINARY, 'rb') as file:
-                data = file.read()
-            for rep in track(replacements, description="Replacing hex values...", style="green"):
-                x_name, x_hex, outfit_name, outfit_hex = rep
-                data = data.replace(bytes.fromhex(x_hex), bytes.fromhex(outfit_hex))
-                time.sleep(0.2)  # simulate processing time for visual effect
-            os.makedirs(MODIFIED_FOLDER, exist_ok=True)
-            modified_file = os.path.join(MODIFIED_FOLDER, os.path.basename(ORIGINAL_BINARY))
-            with open(modified_file, 'wb') as file:
-                file.write(data)
-            return modified_file
-        except Exception as e:
-            raise e
+    conflicts = find_replacement_conflicts(replacements)
+    if conflicts:
+        raise ValueError("; ".join(conflicts))
+    mapping = {bytes.fromhex(x_hex): bytes.fromhex(outfit_hex) for _, x_hex, _, outfit_hex in replacements}
+    with open(ORIGINAL_BINARY, 'rb') as file:
+        data = file.read()
+    with Progress(console=console) as progress:
+        task = progress.add_task("[green]Replacing hex values...", total=len(data))
+        data, counts = substitute_all(data, mapping, lambda position: progress.update(task, completed=position))
+    os.makedirs(MODIFIED_FOLDER, exist_ok=True)
+    modified_file = os.path.join(MODIFIED_FOLDER, os.path.basename(ORIGINAL_BINARY))
+    with open(modified_file, 'wb') as file:
+        file.write(data)
+    return modified_file, {source.hex(): count for source, count in counts.items()}
 
 def mod_kill_message():
     """Main function for the MOD KILLMESSAGE option."""
     clear_screen()
     console.print(Panel("MOD KILLMESSAGE", style="bold magenta"))
     
-    # Load X-Suits from Pastebin with loading animation
-    with console.status("Loading X-Suits...", spinner="dots"):
-        try:
-            xsuits = load_items_from_pastebin(XSUIT_PASTE_ID, PASTEBIN_API_KEY, PASTEBIN_USER_API_KEY)
-            xsuits = {k.replace(" (4-Star)", ""): v for k, v in xsuits.items()}
-        except Exception as e:
-            console.print(f"[red]Failed to load X-Suits: {e}[/red]")
-            return
-    
-    # Load Outfits from Pastebin with loading animation
-    with console.status("Loading Outfits...", spinner="dots"):
-        try:
-            outfits = load_items_from_pastebin(OUTFITS_PASTE_ID, PASTEBIN_API_KEY, PASTEBIN_USER_API_KEY)
-        except Exception as e:
-            console.print(f"[red]Failed to load Outfits: {e}[/red]")
-            return
+    # Load X-Suits and Outfits from the cache, fetching stale ones with loading animation
+    with console.status("Loading X-Suits and Outfits...", spinner="dots"):
+        catalogs, warnings = load_catalogs([XSUIT_PASTE_ID, OUTFITS_PASTE_ID])
+    for warning in warnings:
+        console.print(f"[yellow]{warning}[/yellow]")
+    if XSUIT_PASTE_ID not in catalogs:
+        console.print("[red]Failed to load X-Suits.[/red]")
+        return
+    if OUTFITS_PASTE_ID not in catalogs:
+        console.print("[red]Failed to load Outfits.[/red]")
+        return
+    xsuits = {k.replace(" (4-Star)", ""): v for k, v in catalogs[XSUIT_PASTE_ID].items()}
+    outfits = catalogs[OUTFITS_PASTE_ID]
 
     # Allow user to select multiple X-Suits to replace
     selected_xsuits = choose_multiple_items(xsuits, "Select X-Suits to replace")
@@ -176,6 +314,13 @@ def mod_kill_message():
         console.print("[red]No replacements selected. Returning to main menu.[/red]")
         return
 
+    conflicts = find_replacement_conflicts(replacements)
+    if conflicts:
+        console.print("[red]These replacements conflict with each other:[/red]")
+        for conflict in conflicts:
+            console.print(f"[red]- {conflict}[/red]")
+        return
+
     # Display a summary of the planned replacements
     summary_table = Table(title="Replacement Summary", style="bold cyan", header_style="bold magenta")
     summary_table.add_column("X-Suit", style="magenta")
@@ -191,18 +336,33 @@ def mod_kill_message():
 
     # Perform the hex replacements with progress animation
     try:
-        modified_file = perform_replacements(replacements)
+        modified_file, counts = perform_replacements(replacements)
+        for x_name, x_hex, outfit_name, _ in replacements:
+            occurrences = counts.get(bytes.fromhex(x_hex).hex(), 0)
+            style = "green" if occurrences else "yellow"
+            console.print(f"[{style}]{x_name} → {outfit_name}: {occurrences} occurrence(s)[/{style}]")
         console.print(f"[green]Modified file saved to: {modified_file}[/green]")
     except Exception as e:
         console.print(f"[red]Failed to perform hex replacements: {e}[/red]")
 
+def refresh_catalogs():
+    """Fetch both catalogs again, ignoring the cache TTL."""
+    with console.status("Refreshing X-Suits and Outfits...", spinner="dots"):
+        catalogs, warnings = load_catalogs([XSUIT_PASTE_ID, OUTFITS_PASTE_ID], force_refresh=True)
+    for warning in warnings:
+        console.print(f"[yellow]{warning}[/yellow]")
+    for paste_id, label in ((XSUIT_PASTE_ID, "X-Suits"), (OUTFITS_PASTE_ID, "Outfits")):
+        if paste_id in catalogs:
+            console.print(f"[green]{label}: {len(catalogs[paste_id])} items[/green]")
+
 def main_menu():
     """Displays the main menu with options and handles user selection."""
     while True:
         clear_screen()
         menu_panel = Panel(
             "[bold cyan]1.[/bold cyan] MOD KILLMESSAGE\n"
-            "[bold cyan]2.[/bold cyan] EXIT",
+            "[bold cyan]2.[/bold cyan] EXIT\n"
+            "[bold cyan]3.[/bold cyan] REFRESH CATALOGS",
             title="[bold magenta] BEYONDBIRTHDAY[/bold magenta]",
             subtitle="Select an option",
             style="bold white",
@@ -215,6 +375,9 @@ def main_menu():
         elif choice == "2":
             console.print("[bold red]Exiting...[/bold red]")
             break
+        elif choice == "3":
+            refresh_catalogs()
+            Prompt.ask("\nPress Enter to return to the main menu")
         else:
             console.print("[red]Invalid choice. Please try again.[/red]")
             time.sleep(1)